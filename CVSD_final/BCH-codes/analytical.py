@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+#-*- coding: utf-8 -*-
+
+"""
+Error rates of hard decision bounded distance decoding in closed form.
+
+Over BPSK with AWGN the hard decisions are a binary symmetric channel
+with crossover probability p = Q(1/σ), so the number of errors w in a
+frame is binomial and a decoder correcting up to t errors fails exactly
+when w > t: FER = Σ_{w > t} C(n, w)pʷ(1-p)ⁿ⁻ʷ, summed in the log domain.
+
+Whether a frame with w > t errors is detected as a decoding failure or
+miscorrected to another codeword depends on the weight distribution of
+the code. Here it is estimated with the fraction V(n, t)/2ⁿ⁻ᵏ of all
+words within distance t of some codeword, V(n, t) = Σ_{j ≤ t} C(n, j).
+The BER assumes a failure leaves the w errors and a miscorrection adds
+t more.
+
+Usage: python3 analytical.py [--n N --t T --m M] [--snr 1 2 ...] [--check]
+"""
+
+import math
+import argparse
+
+import channel
+
+def get_log_binomial(n, weight):
+    """
+    Logarithm of C(n, w).
+    """
+    return math.lgamma(n + 1) - math.lgamma(weight + 1) - math.lgamma(n - weight + 1)
+
+def get_log_weight_probability(n, weight, p):
+    """
+    Logarithm of the probability C(n, w)pʷ(1-p)ⁿ⁻ʷ
+    of w errors in n bits of a binary symmetric
+    channel.
+    """
+    return get_log_binomial(n, weight) + weight * math.log(p) + (n - weight) * math.log1p(-p)
+
+def log_sum_exp(values):
+    """
+    Logarithm of the sum of exponents of values,
+    without underflow for small probabilities.
+    """
+    largest = max(values)
+    if largest == float('-inf'):
+        return largest
+    return largest + math.log(sum(math.exp(value - largest) for value in values))
+
+def get_miscorrection_fraction(n, k, t):
+    """
+    Fraction V(n, t)/2ⁿ⁻ᵏ of words within distance t
+    of a codeword, an estimate of the probability
+    that a word with more than t errors is decoded
+    to a wrong codeword.
+    """
+    log_volume = log_sum_exp([get_log_binomial(n, weight) for weight in range(t + 1)])
+    return min(math.exp(log_volume - (n - k) * math.log(2)), 1.0)
+
+def get_error_rates_for_crossover(n, k, t, p):
+    """
+    Error rates of bounded distance decoding over a
+    binary symmetric channel.
+
+    :param n: a length of code.
+    :param k: a length of informative part of code.
+    :param t: a number of errors to correct.
+    :param p: the crossover probability.
+
+    :returns: a dictionary with the keys fer (exact),
+    failure, miscorrection and ber (estimates).
+    """
+    if p <= 0 or t >= n:
+        return {'fer': 0.0, 'failure': 0.0, 'miscorrection': 0.0, 'ber': 0.0}
+
+    weights = range(t + 1, n + 1)
+    log_probabilities = [get_log_weight_probability(n, weight, p) for weight in weights]
+    fer = math.exp(log_sum_exp(log_probabilities))
+    fraction = get_miscorrection_fraction(n, k, t)
+    miscorrection = fer * fraction
+
+    # a failure leaves w wrong bits, a miscorrection about w + t
+    log_bits = [log_probability + math.log(weight + t * fraction)
+                for weight, log_probability in zip(weights, log_probabilities)]
+    ber = min(math.exp(log_sum_exp(log_bits)) / n, 1.0)
+
+    return {'fer': fer, 'failure': fer - miscorrection, 'miscorrection': miscorrection, 'ber': ber}
+
+def get_error_rates(n, k, t, signal_to_noise_ratios):
+    """
+    Error rates of bounded distance decoding of BPSK
+    hard decisions over AWGN.
+
+    :param n: a length of code.
+    :param k: a length of informative part of code,
+    equal to n for an uncoded frame.
+    :param t: a number of errors to correct.
+    :param signal_to_noise_ratios: Eb/N0 points in dB.
+
+    :returns: a list of dictionaries with the keys
+    snr, p, fer, failure, miscorrection and ber, one
+    per point.
+    """
+    table = []
+    for signal_to_noise_ratio in signal_to_noise_ratios:
+        p = channel.get_crossover_probability(channel.get_sigma(signal_to_noise_ratio, k / (n * 1.)))
+        row = get_error_rates_for_crossover(n, k, t, p)
+        row['snr'] = signal_to_noise_ratio
+        row['p'] = p
+        table.append(row)
+    return table
+
+def get_bch_error_rates(bch, signal_to_noise_ratios):
+    """
+    get_error_rates for the n, k and t of a BCH code.
+    """
+    return get_error_rates(bch.n, bch.k, bch.t, signal_to_noise_ratios)
+
+def print_table(table):
+    print("Eb/N0, dB │        p │      FER │  failure │ miscorr. │      BER")
+    for row in table:
+        print("{:>9} │ {:>8.2e} │ {:>8.2e} │ {:>8.2e} │ {:>8.2e} │ {:>8.2e}".format(
+            row['snr'], row['p'], row['fer'], row['failure'], row['miscorrection'], row['ber']))
+
+def cross_check(bch, signal_to_noise_ratios, **simulation_arguments):
+    """
+    Compares the closed form FER and BER with the
+    Monte Carlo engine of simulation.py.
+
+    :returns: a list of tuples (analytical row,
+    simulated row).
+    """
+    import simulation
+
+    analytical = get_bch_error_rates(bch, signal_to_noise_ratios)
+    simulated = simulation.simulate(bch, signal_to_noise_ratios, **simulation_arguments)
+    print("Eb/N0, dB │ FER closed form │ FER Monte Carlo │ BER closed form │ BER Monte Carlo")
+    for row, simulated_row in zip(analytical, simulated):
+        print("{:>9} │ {:>15.2e} │ {:>15.2e} │ {:>15.2e} │ {:>15.2e}".format(
+            row['snr'], row['fer'], simulated_row['fer'], row['ber'], simulated_row['ber']))
+    return list(zip(analytical, simulated))
+
+def main():
+    from bch import BCH, get_primitive_polynomial
+
+    parser = argparse.ArgumentParser(description='Closed form FER/BER of bounded distance BCH decoding over AWGN')
+    parser.add_argument('--n', type=int, default=255, help='a length of code (default: 255)')
+    parser.add_argument('--t', type=int, default=2, help='a number of errors to correct (default: 2)')
+    parser.add_argument('--m', type=int, default=8, help='the power of the field GF(2ᵐ) (default: 8)')
+    parser.add_argument('--snr', type=float, nargs='+', default=[float(x) for x in range(1, 13)], help='Eb/N0 points in dB (default: 1 .. 12)')
+    parser.add_argument('--check', action='store_true', help='compare with a Monte Carlo simulation')
+    parser.add_argument('--max-frames', type=int, default=100000, help='frames per point of the check (default: 100000)')
+    args = parser.parse_args()
+
+    bch = BCH(args.n, 2 * args.t + 1, 1, get_primitive_polynomial(args.m))
+    if args.check:
+        cross_check(bch, args.snr, max_frames=args.max_frames)
+    else:
+        print_table(get_bch_error_rates(bch, args.snr))
+
+if __name__ == '__main__':
+    main()
@@ -7,9 +7,14 @@ for BCH code: m=6, n=63, k=51, t=2
 """
 
 import sys
+import math
 import argparse
+from array import array
+from itertools import islice
 from finitefield import *
 from bch import *
+from registry import get_code
+import llrfile
 
 # BCH code configurations
 BCH_CONFIGS = {
@@ -39,6 +44,36 @@ BCH_CONFIGS = {
         't': 4,
         'input_file': 'p300.txt',
         'answer_file': 'p300a.txt'
+    },
+    '400': {
+        'name': '(63, 51) BCH, soft decision',
+        'm': 6,
+        'n': 63,
+        'k': 51,
+        't': 2,
+        'soft': True,
+        'input_file': 'p400.txt',
+        'answer_file': 'p400a.txt'
+    },
+    '500': {
+        'name': '(255, 239) BCH, soft decision',
+        'm': 8,
+        'n': 255,
+        'k': 239,
+        't': 2,
+        'soft': True,
+        'input_file': 'p500.txt',
+        'answer_file': 'p500a.txt'
+    },
+    '600': {
+        'name': '(1023, 983) BCH, soft decision',
+        'm': 10,
+        'n': 1023,
+        'k': 983,
+        't': 4,
+        'soft': True,
+        'input_file': 'p600.txt',
+        'answer_file': 'p600a.txt'
     }
 }
 
@@ -72,6 +107,29 @@ def llr_to_hard_decision(llr_value):
     """
     return 1 if llr_value < 0 else 0
 
+def parse_llr_row(row):
+    """
+    Parse a row of 8 LLR values at once.
+
+    The row is converted to a 64-bit integer and its bytes are read as
+    signed 8-bit integers, so no LLR is sliced out of the string.
+
+    :param row: 64-bit binary string, LLR values from the most significant bits
+    :returns: array('b') of 8 signed LLR values
+    """
+    return array('b', int(row, 2).to_bytes(8, 'big'))
+
+def llr_values_to_codeword(llr_values, n):
+    """
+    Convert LLR values to the hard decision codeword.
+
+    :param llr_values: LLR0 to LLRn, LLRi is the LLR of X^(n-i)
+    :param n: Codeword length
+    :returns: Integer representing the hard decision codeword
+    """
+    # LLR1 is MSB (position n-1), LLRn is LSB (position 0)
+    return int(''.join(['1' if llr_value < 0 else '0' for llr_value in llr_values[1:n + 1]]), 2)
+
 def parse_llr_rows_to_codeword(llr_rows, n=63):
     """
     Parse LLR rows into a codeword.
@@ -81,37 +139,18 @@ def parse_llr_rows_to_codeword(llr_rows, n=63):
     
     :param llr_rows: List of rows, each row is 64 bits (8 LLR values)
     :param n: Codeword length
-    :returns: Integer representing the hard decision codeword
+    :returns: Integer representing the hard decision codeword and array('b') of LLR values
     """
-    # Concatenate all bits from rows
-    all_bits = ''.join(llr_rows)
-    
-    # Parse into 8-bit LLR values
-    llr_values = []
-    for i in range(0, len(all_bits), 8):
-        llr_8bits_str = all_bits[i:i+8]
-        if len(llr_8bits_str) == 8:
-            llr_signed = parse_8bit_signed_llr(llr_8bits_str)
-            llr_values.append(llr_signed)
+    llr_values = array('b')
+    for row in llr_rows:
+        llr_values.extend(parse_llr_row(row))
     
     # We need n+1 LLR values (LLR0 to LLRn)
-    # LLR0 is don't care, so we use LLR1 to LLR63
+    # LLR0 is don't care, so we use LLR1 to LLRn
     if len(llr_values) < n + 1:
         raise ValueError(f"Not enough LLR values: need {n+1}, got {len(llr_values)}")
     
-    # Convert LLR values to hard decisions
-    # LLR1 corresponds to X^(n-1) (MSB), LLR63 corresponds to X^0 (LSB)
-    hard_decisions = []
-    for i in range(1, n + 1):  # Skip LLR0, use LLR1 to LLR63
-        hard_bit = llr_to_hard_decision(llr_values[i])
-        hard_decisions.append(hard_bit)
-    
-    # Convert to integer: MSB first (LLR1) to LSB last (LLR63)
-    codeword = 0
-    for i, bit in enumerate(hard_decisions):
-        codeword |= (bit << (n - 1 - i))  # LLR1 is MSB (position n-1), LLR63 is LSB (position 0)
-    
-    return codeword, llr_values
+    return llr_values_to_codeword(llr_values, n), llr_values
 
 def get_error_locations(bch, received_codeword):
     """
@@ -120,41 +159,58 @@ def get_error_locations(bch, received_codeword):
     :param bch: BCH code object
     :param received_codeword: Received codeword as integer
     :returns: List of error positions (0-indexed from LSB)
+    :raises DecodingFailure: If the errors can't be corrected
     """
     # Calculate syndromes
-    syndromes, is_error = get_syndromes(
-        primitive_polynomial=bch.primitive_polynomial,
-        received_message=received_codeword,
-        cyclotomic_cosets=bch.cyclotomic_cosets,
-        logarithm_table=bch.logarithm_table,
-        power=bch.power,
-        t=bch.t,
-        b=bch.b
-    )
+    syndromes, is_error = bch.get_syndromes(received_codeword)
     
     if not is_error:
         return []  # No errors detected
     
-    # Use Berlekamp-Massey to find error locator polynomial
-    sigma = berlekamp_massey_decode(
-        syndromes=syndromes,
-        logarithm_table=bch.logarithm_table,
-        power=bch.power,
-        t=bch.t
-    )
-    
-    # Find roots of error locator polynomial
-    roots = find_roots_of_sigma(
-        sigma=sigma,
-        power=bch.power,
-        logarithm_table=bch.logarithm_table
-    )
-    
-    # Convert roots to error positions
-    error_positions = get_error_positions(roots=roots, power=bch.power)
+    # Berlekamp-Massey and root finding among the n positions, raises
+    # DecodingFailure if there are too many errors, e.g. if a root
+    # falls in the positions cut off by shortening or the positions
+    # don't cancel the syndromes
+    error_positions = bch.locate_errors(syndromes)
     
     return error_positions
 
+def get_soft_error_locations(bch, received_codeword, llr_values, flips=CHASE_FLIPS):
+    """
+    Calculate the positions where the Chase-II decoded codeword differs from
+    the hard decision.
+
+    :param bch: BCH code object
+    :param received_codeword: Hard decision codeword as integer
+    :param llr_values: LLR0 to LLRn, LLRi is the LLR of X^(n-i)
+    :param flips: Number of least reliable positions to flip
+    :returns: List of error positions (0-indexed from LSB)
+    :raises DecodingFailure: If no test pattern can be decoded
+    """
+    n = bch.n
+    _, codeword = bch.decode_soft([llr_values[n - i] for i in range(n)], flips=flips)
+    return get_positions_of_binary_ones(codeword ^ received_codeword)
+
+def get_rows_per_input(n):
+    """
+    Each row has 64 bits = 8 LLR values (8 bits each), an input needs
+    (n+1) LLR values (LLR0 to LLRn), so ceil((n+1)/8) rows.
+    """
+    return math.ceil((n + 1) / 8)
+
+def iter_llr_rows(filename):
+    """
+    Stream LLR rows from file.
+    
+    :param filename: Path to the LLR input file
+    :returns: Iterator over LLR strings (one per non-empty line)
+    """
+    with open(filename, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield line
+
 def read_llr_file(filename):
     """
     Read LLR values from file.
@@ -162,133 +218,161 @@ def read_llr_file(filename):
     :param filename: Path to the LLR input file
     :returns: List of LLR strings (one per line)
     """
-    with open(filename, 'r') as f:
-        lines = [line.strip() for line in f.readlines() if line.strip()]
-    return lines
+    return list(iter_llr_rows(filename))
 
-def read_answer_file(filename, t):
+def iter_answers(filename, t, n=None):
     """
-    Read answer file containing expected error positions.
-    
+    Stream expected error positions from an answer file.
+
     Format: Each line is a binary representation of one error position.
-    For each input, there are t lines (one per error position).
-    
+    For each input, there are t lines (one per error position), inputs with
+    fewer errors are padded with positions outside the codeword.
+
     :param filename: Path to the answer file
     :param t: Number of errors per input
-    :returns: List of lists, where each inner list contains error positions for one input
+    :param n: Codeword length, positions from n up are padding and dropped
+    :returns: Iterator over lists of error positions, one per input
     """
-    with open(filename, 'r') as f:
-        lines = [line.strip() for line in f.readlines() if line.strip()]
-    
-    # Group lines by input (t lines per input)
-    answers = []
-    for i in range(0, len(lines), t):
-        input_answers = []
-        for j in range(i, min(i + t, len(lines))):
-            answer_str = lines[j]
-            try:
-                # Each line is a binary number representing one error position
-                error_pos = int(answer_str, 2)
+    input_answers = []
+    count = 0
+    for line in iter_llr_rows(filename):
+        try:
+            # Each line is a binary number representing one error position
+            error_pos = int(line, 2)
+            if n is None or error_pos < n:
                 input_answers.append(error_pos)
-            except ValueError:
-                pass
-        if input_answers:
-            answers.append(input_answers)
+        except ValueError:
+            pass
+        count += 1
+        if count == t:
+            yield input_answers
+            input_answers = []
+            count = 0
+    if count:
+        yield input_answers
+
+def read_answer_file(filename, t, n=None):
+    """
+    Read answer file containing expected error positions.
     
-    return answers
+    :param filename: Path to the answer file
+    :param t: Number of errors per input
+    :param n: Codeword length, positions from n up are padding and dropped
+    :returns: List of lists, where each inner list contains error positions for one input
+    """
+    return list(iter_answers(filename, t, n=n))
+
+def iter_codewords(llr_rows, n=63):
+    """
+    Group LLR rows into inputs of ceil((n+1)/8) rows and parse them.
+
+    A trailing incomplete input is reported and skipped.
 
-def extract_codewords_from_llr(llr_lines, n=63, num_inputs=2, mode='concatenate', verbose=False):
+    :param llr_rows: Iterable of LLR strings (64 bits each = 8 LLR values)
+    :param n: Codeword length
+    :returns: Iterator over tuples (codeword, llr_values)
+    """
+    rows_per_input = get_rows_per_input(n)
+    rows = iter(llr_rows)
+    while True:
+        rows_for_input = list(islice(rows, rows_per_input))
+        if not rows_for_input:
+            return
+        try:
+            yield parse_llr_rows_to_codeword(rows_for_input, n=n)
+        except ValueError as e:
+            print(f"Error: {e}")
+
+def extract_codewords_from_llr(llr_lines, n=63, num_inputs=None, mode='concatenate', verbose=False):
     """
     Extract codewords from LLR lines.
     
     Each row contains 8 LLR values (8-bit signed integers = 64 bits per row).
     For n=63, we need 64 LLR values (LLR0 to LLR63) = 8 rows.
     
-    Mode 'concatenate': For two inputs with 16 rows total:
-    - First 8 rows (lines 0-7) -> first input (64 LLR values)
-    - Next 8 rows (lines 8-15) -> second input (64 LLR values)
+    Mode 'concatenate': consecutive groups of ceil((n+1)/8) rows are inputs,
+    e.g. for n=63 lines 0-7 are the first input, lines 8-15 the second.
     
     Mode 'per_row': Each row represents 8 LLR values (not used for n=63)
     
     :param llr_lines: List of LLR strings (64 bits each = 8 LLR values)
     :param n: Codeword length
-    :param num_inputs: Number of inputs to extract (for concatenate mode)
+    :param num_inputs: Number of inputs to extract, None for all of them
     :param mode: 'concatenate' or 'per_row'
     :param verbose: If True, print detailed parsing information
-    :returns: List of tuples (codeword, llr_values) where codeword is integer and llr_values is list
+    :returns: List of tuples (codeword, llr_values) where codeword is integer and llr_values is array('b')
     """
-    codewords_data = []
-    
     if mode == 'per_row':
         # Each row has 8 LLR values, but we need 64 LLRs for n=63
         # This mode is not suitable for n=63, but kept for flexibility
         print("Warning: per_row mode may not work correctly for n=63")
-        for line in llr_lines:
-            if len(line) >= 64:
-                codeword, llr_vals = parse_llr_rows_to_codeword([line], n=n)
-                codewords_data.append((codeword, llr_vals))
+        codewords = iter_codewords(llr_lines, n=7)
     else:  # mode == 'concatenate'
-        # Calculate rows per input based on n
-        # Each row has 8 LLR values, we need (n+1) LLR values per input
-        import math
-        rows_per_input = math.ceil((n + 1) / 8)
-        total_rows = len(llr_lines)
-        
-        for input_idx in range(num_inputs):
-            start_row = input_idx * rows_per_input
-            end_row = start_row + rows_per_input
-            
-            if verbose:
-                print(f"\n{'='*70}")
-                print(f"Input {input_idx + 1}: Reading rows {start_row} to {end_row-1} ({rows_per_input} rows with 64 bits each)")
-                print(f"  Each row contains 8 LLR values (8-bit signed integers)")
-                print(f"{'='*70}")
-            
-            # Show each row being read
-            rows_for_input = llr_lines[start_row:end_row]
-            if verbose:
-                for i, row in enumerate(rows_for_input):
-                    row_num = start_row + i
-                    print(f"Row {row_num} (line {row_num+1}): {row} (length: {len(row)} bits)")
-                    
-                    # Show the 8 LLR values in this row
-                    llr_in_row = []
-                    for j in range(0, 64, 8):
-                        llr_8bits = row[j:j+8]
-                        llr_signed = parse_8bit_signed_llr(llr_8bits)
-                        llr_in_row.append(llr_signed)
-                    print(f"  LLR values in row: {llr_in_row}")
-            
-            # Parse LLR rows to codeword
-            try:
-                codeword, llr_values = parse_llr_rows_to_codeword(rows_for_input, n=n)
-                codewords_data.append((codeword, llr_values))
-                
-                if verbose:
-                    print(f"\nParsed {len(llr_values)} LLR values (LLR0 to LLR{len(llr_values)-1})")
-                    print(f"  LLR0 (don't care): {llr_values[0]}")
-                    print(f"  LLR1 to LLR{n} used for codeword")
-                    print(f"\nCodeword (integer): {codeword}")
-                    print(f"Codeword (binary, MSB to LSB): {bin(codeword)[2:].zfill(n)}")
-                    
-                    # Show hard decisions for first few and last few LLRs
-                    print(f"\nHard decisions (LLR -> bit):")
-                    for i in range(1, min(6, n+1)):
-                        llr_val = llr_values[i]
-                        hard_bit = llr_to_hard_decision(llr_val)
-                        print(f"  LLR{i} = {llr_val:4d} (signed) -> bit {hard_bit} (X^{n-i})")
-                    if n > 5:
-                        print(f"  ...")
-                        for i in range(max(1, n-4), n+1):
-                            llr_val = llr_values[i]
-                            hard_bit = llr_to_hard_decision(llr_val)
-                            print(f"  LLR{i} = {llr_val:4d} (signed) -> bit {hard_bit} (X^{n-i})")
-                        
-            except ValueError as e:
-                print(f"Error: {e}")
-    
+        codewords = iter_codewords(llr_lines, n=n)
+
+    codewords_data = list(islice(codewords, num_inputs))
+    if verbose:
+        for input_idx, (codeword, llr_values) in enumerate(codewords_data):
+            print_llr_details(input_idx, codeword, llr_values, n)
     return codewords_data
 
+def print_llr_details(input_idx, codeword, llr_values, n):
+    """
+    Print the LLR values of an input row by row and its hard decisions.
+
+    :param input_idx: Index of the input
+    :param codeword: Hard decision codeword as integer
+    :param llr_values: LLR0 to LLRn of the input
+    :param n: Codeword length
+    """
+    rows_per_input = get_rows_per_input(n)
+    start_row = input_idx * rows_per_input
+    print(f"\n{'='*70}")
+    print(f"Input {input_idx + 1}: Reading rows {start_row} to {start_row + rows_per_input - 1} ({rows_per_input} rows with 64 bits each)")
+    print(f"  Each row contains 8 LLR values (8-bit signed integers)")
+    print(f"{'='*70}")
+    for i in range(rows_per_input):
+        print(f"Row {start_row + i} (line {start_row + i + 1}): LLR values in row: {list(llr_values[8 * i:8 * i + 8])}")
+
+    print(f"\nParsed {len(llr_values)} LLR values (LLR0 to LLR{len(llr_values)-1})")
+    print(f"  LLR0 (don't care): {llr_values[0]}")
+    print(f"  LLR1 to LLR{n} used for codeword")
+    print(f"\nCodeword (integer): {codeword}")
+    print(f"Codeword (binary, MSB to LSB): {bin(codeword)[2:].zfill(n)}")
+
+    # Show hard decisions for first few and last few LLRs
+    print(f"\nHard decisions (LLR -> bit):")
+    shown = list(range(1, min(6, n+1)))
+    if n > 5:
+        shown += [None] + list(range(max(1, n-4), n+1))
+    for i in shown:
+        if i is None:
+            print(f"  ...")
+            continue
+        llr_val = llr_values[i]
+        print(f"  LLR{i} = {llr_val:4d} (signed) -> bit {llr_to_hard_decision(llr_val)} (X^{n-i})")
+
+def decode_codewords(bch, codewords, soft=False, flips=CHASE_FLIPS):
+    """
+    Lazily calculate error locations of a stream of codewords.
+
+    :param bch: BCH code object
+    :param codewords: Iterable of tuples (codeword, llr_values)
+    :param soft: If True, use soft-decision (Chase-II) decoding
+    :param flips: Number of least reliable positions to flip
+    :returns: Iterator over tuples (codeword, llr_values, error_positions),
+    error_positions is the DecodingFailure if the errors can't be corrected
+    """
+    for codeword, llr_values in codewords:
+        try:
+            if soft:
+                error_positions = get_soft_error_locations(bch, codeword, llr_values, flips=flips)
+            else:
+                error_positions = get_error_locations(bch, codeword)
+        except DecodingFailure as e:
+            error_positions = e
+        yield codeword, llr_values, error_positions
+
 def main():
     # Parse command-line arguments
     parser = argparse.ArgumentParser(
@@ -299,17 +383,21 @@ BCH Code Options:
   100  - (63, 51) BCH: m=6, n=63, k=51, t=2
   200  - (255, 239) BCH: m=8, n=255, k=239, t=2
   300  - (1023, 983) BCH: m=10, n=1023, k=983, t=4
+  400, 500, 600 - the same codes with soft-decision (Chase-II) decoding
 
 Input/Output files:
   100  - p100.txt / p100a.txt
   200  - p200.txt / p200a.txt
   300  - p300.txt / p300a.txt
+  400  - p400.txt / p400a.txt
+  500  - p500.txt / p500a.txt
+  600  - p600.txt / p600a.txt
         """
     )
     parser.add_argument(
         'code',
-        choices=['100', '200', '300'],
-        help='BCH code selection: 100, 200, or 300'
+        choices=sorted(BCH_CONFIGS),
+        help='BCH code selection: 100, 200, 300, or 400, 500, 600 for soft decision'
     )
     parser.add_argument(
         '--testdata-dir',
@@ -327,6 +415,20 @@ Input/Output files:
         action='store_true',
         help='Show detailed LLR parsing information'
     )
+    parser.add_argument(
+        '--input',
+        type=str,
+        default=None,
+        help='LLR input file, text or binary (see llrfile.py) (default: the input file of the code in --testdata-dir)'
+    )
+    parser.add_argument(
+        '--flips',
+        type=int,
+        choices=range(MAX_FLIPS + 1),
+        metavar='{{0..{}}}'.format(MAX_FLIPS),
+        default=CHASE_FLIPS,
+        help='Number of least reliable positions flipped by soft decision (default: {})'.format(CHASE_FLIPS)
+    )
     
     args = parser.parse_args()
     
@@ -336,80 +438,79 @@ Input/Output files:
     n = config['n']
     k = config['k']
     t = config['t']
-    dist = 2 * t + 1
     b = 1  # Starting power for cyclotomic cosets
     
     print("="*70)
     print(f"BCH Code: {config['name']}")
     print("="*70)
     print(f"Parameters: m = {m}, n = {n}, k = {k}, t = {t}")
+    soft = config.get('soft', False)
+    if soft:
+        print(f"Soft decision: Chase-II flipping {args.flips} least reliable positions")
     
     # Initialize BCH code
     try:
         primitive_poly = get_primitive_polynomial(m)
-        bch = BCH(n, dist, b, primitive_poly)
+        # built once, later runs load it from the cache file
+        bch = get_code(m, n, t, b, primitive_poly, root_finder='closed_form' if soft else 'chien')
         print(f"Primitive polynomial: {bin(primitive_poly)}")
     except Exception as e:
         print(f"Error initializing BCH code: {e}")
         return
     print()
     
-    # Read LLR inputs
-    input_file = f"{args.testdata_dir}/{config['input_file']}"
+    # Stream LLR inputs, the file is read lazily while decoding
+    input_file = args.input or f"{args.testdata_dir}/{config['input_file']}"
     print(f"Reading LLR inputs from: {input_file}")
     try:
-        llr_lines = read_llr_file(input_file)
-        print(f"Found {len(llr_lines)} lines of LLR data")
+        binary_input = llrfile.is_llr_file(input_file)
     except FileNotFoundError:
         print(f"Error: Input file not found: {input_file}")
         return
     except Exception as e:
         print(f"Error reading input file: {e}")
         return
-    print()
-    
-    # Calculate rows per input
-    # Each row has 64 bits = 8 LLR values (8 bits each)
-    # We need (n+1) LLR values per input (LLR0 to LLRn)
-    # So we need ceil((n+1)/8) rows per input
-    import math
-    rows_per_input = math.ceil((n + 1) / 8)
-    total_rows_needed = rows_per_input * 2  # Assuming 2 inputs
     
+    rows_per_input = get_rows_per_input(n)
     print(f"Rows per input: {rows_per_input} (need {n+1} LLR values, 8 per row)")
-    print(f"Total rows needed for 2 inputs: {total_rows_needed}")
     print()
     
-    # Extract codewords
-    num_inputs = 2
-    extraction_mode = 'concatenate'
-    
-    # Set verbose flag for extraction
-    global_extraction_verbose = args.verbose
-    
-    codewords_data = extract_codewords_from_llr(llr_lines, n=n, num_inputs=num_inputs, mode=extraction_mode, verbose=args.verbose)
-    print(f"\n{'='*70}")
-    print(f"Summary: Extracted {len(codewords_data)} codeword(s) from {len(llr_lines)} rows (mode: {extraction_mode})")
-    print(f"{'='*70}\n")
-    
-    # Read answer file if requested
-    answer_data = None
+    # Stream expected answers if requested
+    answers = None
     if args.compare:
         answer_file = f"{args.testdata_dir}/{config['answer_file']}"
         print(f"Reading expected answers from: {answer_file}")
         try:
-            answer_data = read_answer_file(answer_file, t)
-            print(f"Found {len(answer_data)} input(s) with error positions")
-            for idx, ans in enumerate(answer_data):
-                print(f"  Input {idx+1}: {sorted(ans)}")
+            open(answer_file, 'r').close()
+            answers = iter_answers(answer_file, t, n=n)
         except FileNotFoundError:
             print(f"Warning: Answer file not found: {answer_file}")
         except Exception as e:
             print(f"Warning: Error reading answer file: {e}")
         print()
     
+    if binary_input:
+        try:
+            codewords = llrfile.iter_llr_file(input_file, n=n, code_id=int(args.code))
+        except ValueError as e:
+            print(f"Error reading input file: {e}")
+            return
+    else:
+        codewords = iter_codewords(iter_llr_rows(input_file), n=n)
+    results = decode_codewords(bch, codewords, soft=soft, flips=args.flips)
+    
+    input_count = 0
+    failure_count = 0
+    match_count = 0
+    mismatch_count = 0
+    
     # Process each codeword and find error locations
-    for idx, (r, llr_vals) in enumerate(codewords_data):
+    for idx, (r, llr_vals, error_positions) in enumerate(results):
+        input_count += 1
+        expected_positions = next(answers, None) if answers is not None else None
+        
+        if args.verbose:
+            print_llr_details(idx, r, llr_vals, n)
         print(f"{'='*70}")
         print(f"Input {idx + 1}:")
         if args.verbose:
@@ -417,8 +518,11 @@ Input/Output files:
             print(f"  Received codeword r (hex): {hex(r)}")
         print()
         
-        # Calculate error locations
-        error_positions = get_error_locations(bch, r)
+        if isinstance(error_positions, DecodingFailure):
+            failure_count += 1
+            print(f"  Decoding failure: {error_positions}")
+            print()
+            continue
         
         if len(error_positions) == 0:
             print("  No errors detected!")
@@ -430,23 +534,31 @@ Input/Output files:
                 print(f"    - Bit position {pos} (LSB-indexed) / Position {msb_pos} (MSB-indexed)")
         
         # Compare with answer file if available
-        if args.compare and answer_data and idx < len(answer_data):
-            expected_positions = answer_data[idx]
+        if expected_positions is not None:
             print(f"\n  Expected error positions (from answer file): {sorted(expected_positions)}")
             if set(error_positions) == set(expected_positions):
+                match_count += 1
                 print("  ✓ MATCH: Computed positions match expected positions!")
             else:
+                mismatch_count += 1
                 print("  ✗ MISMATCH: Computed positions do not match expected positions")
                 print(f"    Computed: {sorted(error_positions)}")
                 print(f"    Expected: {sorted(expected_positions)}")
         
-        # Also decode to see the corrected codeword
-        if args.verbose:
-            decoded_msg, corrected_codeword = bch.decode_ex(r)
-            if r != corrected_codeword:
-                print(f"\n  Corrected codeword: {bin(corrected_codeword)[2:].zfill(n)}")
-                print(f"  Decoded message: {bin(decoded_msg)[2:].zfill(k)}")
+        # Also show the corrected codeword
+        if args.verbose and error_positions:
+            corrected_codeword = r
+            for pos in error_positions:
+                corrected_codeword ^= 1 << pos
+            print(f"\n  Corrected codeword: {bin(corrected_codeword)[2:].zfill(n)}")
+            print(f"  Decoded message: {bin(corrected_codeword >> (n - k))[2:].zfill(k)}")
         print()
+    
+    print(f"{'='*70}")
+    print(f"Summary: Decoded {input_count} codeword(s), {failure_count} decoding failure(s)")
+    if answers is not None:
+        print(f"  {match_count} match(es), {mismatch_count} mismatch(es)")
+    print(f"{'='*70}")
 
 if __name__ == '__main__':
     main()
@@ -1,46 +1,23 @@
 #!/usr/bin/env python3 
 #-*- coding: utf-8 -*-
 
-import math
-import random
-import multiprocessing
-
-PRE_DEFINED = True
+ANALYTICAL = True # closed form curves of analytical.py, otherwise a Monte Carlo simulation
 PLOT = True
+BATCH = True # decode with BCH.decode_batch, otherwise word by word
 
 if PLOT:
     import matplotlib.pyplot as plt
 
-from bch import *
+import numpy as np
 
-def get_random_messages(count, n):
-    messages = []
-    for _ in range(count):
-        candidate = random.getrandbits(n)
-        messages.append(candidate)
-    
-    return messages
-
-def bits_to_signal(bits):
-    signal_array = []
-    for i in range(msb(bits), -1, -1):
-        signal_array.append(1. if is_bit_set(bits, i) else -1.)
-    return signal_array
-
-def add_noise_to_signal(signal, sigma):
-    return [random.gauss(i, sigma) for i in signal]
-
-def signal_to_bits(signal):
-    res = 0
-    for i in signal:
-        res <<= 1
-        res ^= 1 if i > 0 else 0
-    return res
+from bch import *
+import batch
+import channel
 
 def get_sigma_by_SNR_and_speed(signal_to_noise_ratio, code_speed):
-    return math.sqrt(1.0 / (2 * code_speed * math.pow(10, x / 10.0)))
+    return channel.get_sigma(signal_to_noise_ratio, code_speed)
 
-def awgn_with_coding(iteration_count, signal_to_noise_ratio, n, bch=None):
+def awgn_with_coding(iteration_count, signal_to_noise_ratio, n, bch=None, seed=None):
     if bch is not None:
         code_speed = bch.k / (bch.n * 1.) 
         k = bch.k
@@ -49,108 +26,65 @@ def awgn_with_coding(iteration_count, signal_to_noise_ratio, n, bch=None):
         code_speed = 1
 
     sigma = get_sigma_by_SNR_and_speed(signal_to_noise_ratio, code_speed)
+    rng = np.random.default_rng(seed)
 
-    counter = 0
-    errors_message = 0
-    errors_word = 0
-
-    for block in get_random_messages(count=iteration_count, n=k):
-        if VERBOSE:
-            print("-----------------------------")
-            print(bin(block)[2:])
-
-        # encode
-        if bch is not None:
-            codeword = bch.encode(block)
-            if VERBOSE:
-                print(bin(codeword)[2:])
-        else:
-            codeword = block
-
-        # create signal
-        signal = bits_to_signal(codeword)
-        if VERBOSE:
-            print(signal)
-
-        # noise
-        distorted_signal = add_noise_to_signal(signal, sigma)
-        if VERBOSE:
-            print(distorted_signal)
-
-        # recieve
-        recv = signal_to_bits(distorted_signal)
-        if VERBOSE:
-            print(bin(recv)[2:])
-
-        # decode
-        if bch is not None:
-            message, decoded_codeword = bch.decode_ex(recv)
-            if VERBOSE:
-                print(bin(message)[2:])
-
-            if codeword != decoded_codeword:
-                if VERBOSE:
-                    print("Error word on iteration {}".format(counter))
-                errors_word += 1
-
-            if block != message:
-                if VERBOSE:
-                    print("Error message on iteration {}".format(counter))
-                errors_message += 1
-        else:
-            if recv != block:
-                if VERBOSE:
-                    print("Error word on iteration {}".format(counter))
-                errors_word += 1
-
-        print("SNR: {}\t-> iteration: {}".format(signal_to_noise_ratio, counter))
-        counter += 1
-
-    return errors_word, errors_message
+    # encode
+    blocks = rng.integers(0, 2, size=(iteration_count, k), dtype=np.uint8)
+    codewords = bch.encode_batch(blocks) if bch is not None else blocks
 
-def awgn_worker(signal_to_noise_ratio, test_number, n, bch, return_dict):
-    no_coding_result = (awgn_with_coding(iteration_count=test_number, signal_to_noise_ratio=signal_to_noise_ratio, n=n)[0] / (test_number * 1.))
+    # signal, noise and recieve
+    received = channel.hard_decisions(channel.transmit(codewords, sigma, rng))
 
-    signal_to_noise_ratio_result = (awgn_with_coding(iteration_count=test_number, signal_to_noise_ratio=signal_to_noise_ratio, n=n, bch=bch)[0] / (test_number * 1.))
+    # decode
+    if bch is None:
+        decoded_codewords, messages = received, received
+    elif BATCH:
+        decoded_codewords, messages, _ = bch.decode_batch(received)
+    else:
+        decoded = []
+        for recv in batch.bits_to_ints(received):
+            try:
+                decoded.append(bch.decode_ex(recv)[1])
+            except DecodingFailure:
+                decoded.append(recv)
+        decoded_codewords = batch.ints_to_bits(decoded, bch.n)
+        messages = decoded_codewords[:, bch.n - bch.k:]
+
+    errors_word = int((decoded_codewords != codewords).any(axis=1).sum())
+    errors_message = int((messages != blocks).any(axis=1).sum())
+
+    if VERBOSE:
+        print("SNR: {}\t-> {} iterations, {} word errors, {} message errors".format(
+            signal_to_noise_ratio, iteration_count, errors_word, errors_message))
 
-    return_dict[signal_to_noise_ratio] = no_coding_result, signal_to_noise_ratio_result
+    return errors_word, errors_message
 
 if __name__ == '__main__':
     x_array = [_ for _ in range(1, 14)]
 
-    signal_to_noise_ratio_result = []
-    no_coding_result = []
+    # a 512-bit block is the (1023, 718) code of GF(2¹⁰) shortened
+    # to n = 512, GF(2⁹) has only 511 positions
+    n = 512
+    bch = BCH(n, 63, 1, get_primitive_polynomial(10))
 
-    if not PRE_DEFINED:
-        manager = multiprocessing.Manager()
-        return_dict = manager.dict()
-        jobs = []
+    if not ANALYTICAL:
+        import simulation
 
-        test_number = 10000
+        # every Eb/N0 point runs until 100 frame errors or 10,000 frames
+        coded = simulation.simulate(bch, x_array, seed=1, target_frame_errors=100, max_frames=10000)
+        uncoded = simulation.simulate(None, x_array, n=n, seed=1, target_frame_errors=100, max_frames=10000)
 
-        n = 512
-        bch = BCH(n, 63, 1, get_primitive_polynomial(9))
-        
-        for x in x_array:
-            p = multiprocessing.Process(target=awgn_worker, args=(x, test_number, n, bch, return_dict))
-            jobs.append(p)
-            p.start()
-
-        for proc in jobs:
-            proc.join()
-        
-        return_list = sorted(return_dict.items())
+    else:
+        import analytical
 
-        for key, value in return_list:
-            no_coding_result.append(value[0])
-            signal_to_noise_ratio_result.append(value[1])
+        coded = analytical.get_bch_error_rates(bch, x_array)
+        uncoded = analytical.get_error_rates(n, n, 0, x_array)
 
-        print("No coding: {}".format(no_coding_result))
-        print("SNR: {}".format(signal_to_noise_ratio_result))
+    signal_to_noise_ratio_result = [row['fer'] for row in coded]
+    no_coding_result = [row['fer'] for row in uncoded]
 
-    else: #                             1    2       3       4       5       6       7       8       9       10      11      12    
-        signal_to_noise_ratio_result = [1.0, 0.9998, 0.9498, 0.3764, 0.027 , 0.0138, 0.0065, 0.0033, 0.0009, 0.0004, 0.0001, 0.0   ]
-        no_coding_result             = [1.0, 1.0   , 1.0   , 0.9979, 0.9517, 0.7106, 0.325 , 0.0908, 0.018 , 0.0023, 0.0004, 0.0001]
+    print("No coding: {}".format(no_coding_result))
+    print("SNR: {}".format(signal_to_noise_ratio_result))
 
     if PLOT:
         plt.plot(x_array[0:len(signal_to_noise_ratio_result)], signal_to_noise_ratio_result, 'o') # points
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+#-*- coding: utf-8 -*-
+
+"""
+Decoding of many received words of one BCH code at once with NumPy.
+
+A batch of words is either an (N, n) uint8 matrix of bits, where
+column i is the coefficient of xⁱ, or an (N, ⌈n/64⌉) uint64 matrix
+of packed words, where bit j of word w is the coefficient of x⁶⁴ʷ⁺ʲ.
+"""
+
+import numpy as np
+
+from bch import is_square_syndrome
+
+DECODE_NO_ERRORS = 0
+DECODE_CORRECTED = 1
+DECODE_FAILURE   = 2
+
+CHIEN_CHUNK = 1024
+
+def ints_to_bits(words, n):
+    """
+    Converts integers to a bit matrix.
+
+    :param words: a sequence of integers.
+    :param n: a length of a word.
+
+    :returns: an (N, n) uint8 matrix.
+    """
+    byte_count = (n + 7) // 8
+    data = b"".join(word.to_bytes(byte_count, 'little') for word in words)
+    bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8).reshape(-1, byte_count), axis=1, bitorder='little')
+    return bits[:, :n]
+
+def bits_to_ints(bits):
+    """
+    Converts a bit matrix to integers.
+
+    :param bits: an (N, n) matrix of bits.
+
+    :returns: a list of N integers.
+    """
+    packed = np.packbits(np.asarray(bits, dtype=np.uint8), axis=1, bitorder='little')
+    return [int.from_bytes(row.tobytes(), 'little') for row in packed]
+
+def packed_to_bits(packed, n):
+    """
+    Unpacks uint64 words to a bit matrix.
+
+    :param packed: an (N, ⌈n/64⌉) uint64 matrix.
+    :param n: a length of a word.
+
+    :returns: an (N, n) uint8 matrix.
+    """
+    packed = np.ascontiguousarray(packed, dtype='<u8')
+    bits = np.unpackbits(packed.view(np.uint8), axis=1, bitorder='little')
+    return bits[:, :n]
+
+def bits_to_packed(bits):
+    """
+    Packs a bit matrix to uint64 words.
+
+    :param bits: an (N, n) matrix of bits.
+
+    :returns: an (N, ⌈n/64⌉) uint64 matrix.
+    """
+    bits = np.asarray(bits, dtype=np.uint8)
+    count, n = bits.shape
+    padded = np.zeros((count, -(-n // 64) * 64), dtype=np.uint8)
+    padded[:, :n] = bits
+    return np.packbits(padded, axis=1, bitorder='little').view('<u8')
+
+def field_mul(field, a, b):
+    """
+    Element-wise product of two arrays of
+    elements of GF(2ᵖᵒʷᵉʳ).
+    """
+    exp = field.exp_array
+    log = field.log_array
+    return np.where((a != 0) & (b != 0), exp[log[a] + log[b]], 0)
+
+def field_inv(field, a):
+    """
+    Element-wise inverse of an array of
+    nonzero elements, zero stays zero.
+    """
+    exp = field.exp_array
+    log = field.log_array
+    return np.where(a != 0, exp[field.order - log[a]], 0)
+
+def get_syndrome_matrix(field, n, t, b):
+    """
+    Builds a binary matrix whose product with a
+    bit matrix gives the bits of the syndromes
+    which are not squares of other syndromes.
+
+    :param field: the Galois field GF(2ᵖᵒʷᵉʳ).
+    :param n: a length of code.
+    :param t: a number of errors to correct.
+    :param b: a power of element from witch we choose
+    cyclotomic cosets for generator polynomial.
+
+    :returns: an (n, R * power) float32 matrix, where
+    R is the number of directly computed syndromes.
+    """
+    exponents = [j for j in range(b, b + 2 * t) if not is_square_syndrome(j, b)]
+    positions = np.arange(n, dtype=np.int64)
+    shifts = np.arange(field.power, dtype=np.int64)
+    columns = []
+    for j in exponents:
+        elements = field.exp_array[(positions * j) % field.order]
+        columns.append((elements[:, None] >> shifts) & 1)
+    return np.concatenate(columns, axis=1).astype(np.float32)
+
+def batch_syndromes(bits, syndrome_matrix, field, t, b):
+    """
+    Calculates syndromes of every word of a batch.
+
+    :param bits: an (N, n) matrix of received bits.
+    :param syndrome_matrix: a matrix from
+    get_syndrome_matrix.
+    :param field: the Galois field GF(2ᵖᵒʷᵉʳ).
+    :param t: a number of errors to correct.
+    :param b: a power of element from witch we choose
+    cyclotomic cosets for generator polynomial.
+
+    :returns: an (N, 2t) array of syndromes as
+    field elements.
+    """
+    count = bits.shape[0]
+    power = field.power
+    counts = np.asarray(bits, dtype=np.float32) @ syndrome_matrix
+    syndrome_bits = counts.astype(np.int64) & 1
+    weights = np.int64(1) << np.arange(power, dtype=np.int64)
+    direct = (syndrome_bits.reshape(count, syndrome_matrix.shape[1] // power, power) * weights).sum(axis=2)
+
+    syndromes = np.zeros((count, 2 * t), dtype=np.int64)
+    row = 0
+    for index in range(2 * t):
+        j = b + index
+        if is_square_syndrome(j, b):
+            root = syndromes[:, j // 2 - b]
+            syndromes[:, index] = field_mul(field, root, root)
+        else:
+            syndromes[:, index] = direct[:, row]
+            row += 1
+    return syndromes
+
+def batch_berlekamp_massey(syndromes, field, t):
+    """
+    Runs the Berlekamp-Massey algorithm for every
+    row of syndromes at once.
+
+    :param syndromes: an (N, 2t) array of syndromes.
+    :param field: the Galois field GF(2ᵖᵒʷᵉʳ).
+    :param t: a number of errors to correct.
+
+    :returns: an (N, 2t + 1) array of coefficients of
+    the error locator polynomials, lowest power first,
+    and an array of their lengths L.
+    """
+    count = syndromes.shape[0]
+    width = 2 * t + 1
+
+    C = np.zeros((count, width), dtype=np.int64)
+    C[:, 0] = 1
+    B = C.copy()
+    L = np.zeros(count, dtype=np.int64)
+
+    for r in range(2 * t):
+        delta = np.zeros(count, dtype=np.int64)
+        for i in range(r + 1):
+            delta ^= field_mul(field, C[:, i], syndromes[:, r - i])
+
+        B = np.roll(B, 1, axis=1)
+        B[:, 0] = 0
+
+        nonzero = delta != 0
+        update = nonzero & (2 * L <= r)
+
+        T = C ^ field_mul(field, B, delta[:, None])
+        B = np.where(update[:, None], field_mul(field, C, field_inv(field, delta)[:, None]), B)
+        C = np.where(nonzero[:, None], T, C)
+        L = np.where(update, r + 1 - L, L)
+
+    return C, L
+
+def batch_chien_search(sigma, field, n):
+    """
+    Evaluates error locator polynomials at α⁻ⁱ
+    for every position i of a codeword.
+
+    :param sigma: an (N, W) array of coefficients
+    of error locator polynomials.
+    :param field: the Galois field GF(2ᵖᵒʷᵉʳ).
+    :param n: a length of code.
+
+    :returns: an (N, n) bool matrix, True where
+    the position is a root, i.e. an error.
+    """
+    count, width = sigma.shape
+    exp = field.exp_array
+    log = field.log_array
+    positions = np.arange(n, dtype=np.int64)
+
+    errors = np.zeros((count, n), dtype=bool)
+    for start in range(0, count, CHIEN_CHUNK):
+        chunk = sigma[start:start + CHIEN_CHUNK]
+        value = np.zeros((chunk.shape[0], n), dtype=np.int64)
+        for power in range(width):
+            coefficient = chunk[:, power]
+            present = coefficient != 0
+            if not present.any():
+                continue
+            shift = (-positions * power) % field.order
+            term = exp[log[coefficient][:, None] + shift[None, :]]
+            value ^= np.where(present[:, None], term, 0)
+        errors[start:start + CHIEN_CHUNK] = value == 0
+    return errors
+
+def decode_batch(bits, field, syndrome_matrix, t, b, n, k):
+    """
+    Decodes a batch of received words.
+
+    :param bits: an (N, n) matrix of received bits.
+    :param field: the Galois field GF(2ᵖᵒʷᵉʳ).
+    :param syndrome_matrix: a matrix from
+    get_syndrome_matrix.
+    :param t: a number of errors to correct.
+    :param b: a power of element from witch we choose
+    cyclotomic cosets for generator polynomial.
+    :param n: a length of code.
+    :param k: a length of informative part of code.
+
+    :returns: corrected codewords and messages as bit
+    matrices and an array of DECODE_* statuses.
+    """
+    bits = np.array(bits, dtype=np.uint8)
+    count = bits.shape[0]
+    status = np.full(count, DECODE_NO_ERRORS, dtype=np.int8)
+
+    syndromes = batch_syndromes(bits, syndrome_matrix, field, t, b)
+    erroneous = np.flatnonzero(syndromes.any(axis=1))
+
+    if erroneous.size:
+        sigma, L = batch_berlekamp_massey(syndromes[erroneous], field, t)
+        errors = batch_chien_search(sigma[:, :t + 1], field, n)
+
+        degree = sigma.shape[1] - 1 - np.argmax((sigma != 0)[:, ::-1], axis=1)
+        found = errors.sum(axis=1)
+        correctable = (L <= t) & (degree == L) & (found == L)
+
+        fixed = erroneous[correctable]
+        corrected = bits[fixed] ^ errors[correctable].astype(np.uint8)
+
+        # σ may have deg σ roots which don't cancel the syndromes
+        consistent = ~batch_syndromes(corrected, syndrome_matrix, field, t, b).any(axis=1)
+        bits[fixed[consistent]] = corrected[consistent]
+        status[fixed[consistent]] = DECODE_CORRECTED
+        status[fixed[~consistent]] = DECODE_FAILURE
+        status[erroneous[~correctable]] = DECODE_FAILURE
+
+    return bits, bits[:, n - k:], status
+
+def get_remainders(values, remainder_table, degree, width):
+    """
+    Remainders of many messages by the generator
+    polynomial, a chunk of bits at a time for all the
+    messages together.
+
+    :param values: an (N, C) array of width-bit chunks
+    of the messages, the lowest chunk first.
+    :param remainder_table: a uint64 array from
+    bch.get_remainder_table.
+    :param degree: a degree of the generator
+    polynomial, degree + width must fit in 64 bits.
+    :param width: a number of bits consumed per
+    lookup, 8 or 16.
+
+    :returns: a uint64 array of N remainders of
+    xᵈᵉᵍʳᵉᵉ·m(x).
+    """
+    count, chunks = values.shape
+    mask = np.uint64((1 << degree) - 1)
+    shift = np.uint64(degree)
+    step = np.uint64(width)
+
+    remainder = np.zeros(count, dtype=np.uint64)
+    for chunk in range(chunks - 1, -1, -1):
+        remainder = (remainder << step) ^ (values[:, chunk].astype(np.uint64) << shift)
+        remainder = (remainder & mask) ^ remainder_table[remainder >> shift]
+    return remainder
+
+def encode_batch(bits, remainder_table, degree, width):
+    """
+    Encodes a batch of messages systematically.
+
+    :param bits: an (N, k) matrix of message bits.
+    :param remainder_table: a uint64 array from
+    bch.get_remainder_table.
+    :param degree: a degree of the generator
+    polynomial, degree + width must fit in 64 bits.
+    :param width: a number of bits consumed per
+    lookup, 8 or 16.
+
+    :returns: an (N, degree + k) matrix of codeword bits.
+    """
+    count, k = bits.shape
+    chunks = -(-k // width)
+    padded = np.zeros((count, chunks * width), dtype=np.uint8)
+    padded[:, :k] = bits
+    values = np.packbits(padded, axis=1, bitorder='little')
+    if width == 16:
+        values = values.view('<u2')
+
+    remainder = get_remainders(values, remainder_table, degree, width)
+    remainder_bits = np.unpackbits(remainder.astype('<u8').view(np.uint8).reshape(count, 8), axis=1, bitorder='little')
+
+    codewords = np.empty((count, degree + k), dtype=np.uint8)
+    codewords[:, :degree] = remainder_bits[:, :degree]
+    codewords[:, degree:] = bits
+    return codewords
+
+def encode_ints(messages, k, remainder_table, degree, width):
+    """
+    Encodes a batch of messages given as integers,
+    their bytes being the chunks of the remainder
+    computation without a bit matrix in between.
+
+    :param messages: a sequence of integers of at
+    most k bits.
+    :param k: a length of informative part of code.
+    :param remainder_table: a uint64 array from
+    bch.get_remainder_table.
+    :param degree: a degree of the generator
+    polynomial, degree + width must fit in 64 bits.
+    :param width: a number of bits consumed per
+    lookup, 8 or 16.
+
+    :returns: a list of codewords as integers.
+    """
+    byte_count = -(-k // width) * width // 8
+    data = b"".join(message.to_bytes(byte_count, 'little') for message in messages)
+    values = np.frombuffer(data, dtype=np.uint8 if width == 8 else '<u2').reshape(len(messages), -1)
+    remainders = get_remainders(values, remainder_table, degree, width).tolist()
+    return [message << degree | remainder for message, remainder in zip(messages, remainders)]
@@ -1,19 +1,106 @@
 #!/usr/bin/env python3
 #-*- coding: utf-8 -*-
 
+import os
 import math
 import random
-import copy
+import pickle
+from itertools import combinations
 
 from finitefield import *
 
 VERBOSE = False
 TEST    = False
 
+SYNDROME_METHODS = ('direct', 'division', 'remainder')
+ROOT_FINDERS = ('chien', 'closed_form')
+DECODERS = ('algebraic', 'lookup')
+REMAINDER_TABLE_WIDTH = 8 # bits of a message consumed per table lookup
+LOOKUP_MAX_PARITY_BITS = 20 # the largest syndrome space of the lookup decoder
+CHASE_FLIPS = 2 # least reliable positions flipped by the Chase-II decoder
+MAX_FLIPS = 16 # at most 2¹⁶ test patterns per received word
+TABLE_MEMORY_BUDGET = 64 << 20 # bytes of the tables built for one code
+ROOT_TABLE_ENTRY_BYTES = 96 # list slots and tuples of get_root_tables per element
+CHIEN_VECTORIZED_LENGTH = 4096 # codes at least this long are searched with NumPy if installed
+REMAINDER_SYNDROME_LENGTH = 4096 # codes at least this long use the 'remainder' syndromes by default
+
+class DecodingFailure(Exception):
+    """
+    A received word has more errors than the
+    code can correct: the error locator polynomial
+    doesn't have as many roots among the positions
+    of a codeword as its degree.
+    """
+
+class IncrementalSyndromes:
+    """
+    Syndromes of a received word kept up to date
+    while bits of the word are flipped: flipping
+    position i adds the precomputed column αʲⁱ
+    to every directly evaluated syndrome Sⱼ, the
+    others are squares of them. A flip of f bits
+    costs O(t·f) instead of O(n·t).
+    """
+
+    def __init__(self, received_message, syndrome_table, field, t, b):
+        """
+        :param received_message: a base word.
+        :param syndrome_table: a table from
+        get_syndrome_table.
+        :param field: the Galois field GF(2ᵖᵒʷᵉʳ).
+        :param t: a number of errors to correct.
+        :param b: a power of element from witch we choose
+        cyclotomic cosets for generator polynomial.
+        """
+        self.syndrome_table = syndrome_table
+        self.field = field
+        self.t = t
+        self.b = b
+        self.received_message = received_message
+        syndromes, _ = evaluate_syndromes(received_message, syndrome_table, field, t, b)
+        self.values = [field.element(syndrome) for syndrome in syndromes]
+
+    def flip(self, positions):
+        """
+        Flips bits of the word and updates the
+        syndromes, flipping them again undoes it.
+
+        :param positions: positions of the bits.
+        """
+        for position in positions:
+            self.received_message ^= 1 << position
+            for index, row in enumerate(self.syndrome_table):
+                if row is not None:
+                    self.values[index] ^= row[position]
+
+        for index, row in enumerate(self.syndrome_table):
+            if row is None:
+                root = self.values[(self.b + index) // 2 - self.b]
+                self.values[index] = self.field.mul(root, root)
+
+    def copy(self):
+        syndromes = IncrementalSyndromes.__new__(IncrementalSyndromes)
+        syndromes.__dict__.update(self.__dict__)
+        syndromes.values = list(self.values)
+        return syndromes
+
+    @property
+    def syndromes(self):
+        """
+        Syndromes in the form of get_syndromes: powers
+        of a primitive element, -1 for zero.
+        """
+        return [self.field.logarithm(value) for value in self.values]
+
+    @property
+    def is_error(self):
+        return any(self.values)
+
 class BCH:
     """Bose–Chaudhuri–Hocquenghem error-correcting code."""
 
-    def __init__(self, n, dist, b, primitive_polynomial):
+    def __init__(self, n, dist, b, primitive_polynomial, syndrome_method=None, root_finder='chien',
+                 decoder='algebraic', lookup_table_file=None):
         """
         Constructs a BCH code with the
         specified parameters.
@@ -25,8 +112,50 @@ class BCH:
         :param b: a power of element from witch we choose
         cyclotomic cosets for generator polynomial. 
         :param primitive_polynomial: a primitive polynomial
-        used to create logarithm table.
+        used to create the field tables.
+        :param syndrome_method: 'direct' evaluates the
+        syndromes at the set bits of a received word,
+        'division' reduces it by minimal polynomials first,
+        'remainder' reduces it by the generator polynomial
+        with the encoder's remainder table and evaluates
+        the remainder of deg g bits. By default 'direct', and
+        'remainder' for codes of at least
+        REMAINDER_SYNDROME_LENGTH bits. 'direct' falls back
+        to 'remainder' if its table of n elements per
+        syndrome exceeds TABLE_MEMORY_BUDGET.
+        :param root_finder: 'chien' searches the roots of
+        an error locator polynomial over all positions,
+        'closed_form' solves polynomials of degree up to 4
+        with lookup tables and falls back to Chien search
+        for higher degrees, or always if the tables exceed
+        TABLE_MEMORY_BUDGET.
+        :param decoder: 'algebraic' decodes with syndromes,
+        Berlekamp-Massey and root finding, 'lookup' maps the
+        remainder of a received word to an error pattern
+        with a table built at construction, only for codes
+        with at most LOOKUP_MAX_PARITY_BITS parity bits.
+        :param lookup_table_file: a file to load the table
+        of the lookup decoder from, it is built and saved
+        there if the file doesn't exist.
+
+        A code with n < 2ᵖᵒʷᵉʳ - 1 is the shortened code, its
+        words are the words of the full length code with
+        zeroes at the top 2ᵖᵒʷᵉʳ - 1 - n positions, which are
+        neither stored nor searched for errors.
+
+        :raises: ValueError if n is above 2ᵖᵒʷᵉʳ - 1 or not
+        above deg g, or if the exponent and logarithm
+        tables of the field exceed TABLE_MEMORY_BUDGET.
         """
+        if syndrome_method is None:
+            syndrome_method = 'remainder' if n >= REMAINDER_SYNDROME_LENGTH else 'direct'
+        if syndrome_method not in SYNDROME_METHODS:
+            raise ValueError("Unknown syndrome method '{}', expected one of {}".format(syndrome_method, SYNDROME_METHODS))
+        if root_finder not in ROOT_FINDERS:
+            raise ValueError("Unknown root finder '{}', expected one of {}".format(root_finder, ROOT_FINDERS))
+        if decoder not in DECODERS:
+            raise ValueError("Unknown decoder '{}', expected one of {}".format(decoder, DECODERS))
+
         self.dist = dist
         t = (dist - 1) >> 1 # dist = 2*t + 1 - for binary
         self.t = t
@@ -34,36 +163,44 @@ class BCH:
         self.b = b
         power = msb(primitive_polynomial)
         self.power = power
+        if not 0 < n <= 2 ** power - 1:
+            raise ValueError("A code of length n = {} doesn't fit GF(2^{}), n must be at most {}".format(n, power, 2 ** power - 1))
+        item_size = 2 if power <= 16 else 4
+        if 3 * item_size << power > TABLE_MEMORY_BUDGET:
+            raise ValueError("The tables of GF(2^{}) need {} bytes, the budget is {}".format(power, 3 * item_size << power, TABLE_MEMORY_BUDGET))
         
-        full_cyclotomic_cosets = get_cyclotomic_cosets(power=power)
         if VERBOSE:
-            print("All cosets: {}".format("\n".join(binary_to_string(i, False) for i in full_cyclotomic_cosets)))
+            print("All cosets: {}".format("\n".join(binary_to_string(i, False) for i in get_cyclotomic_cosets(power=power))))
 
-        beta_powers = [i % (2 ** power - 1) for i in range(b, b + dist - 1)]
+        order = 2 ** power - 1
+        beta_powers = [i % order for i in range(b, b + dist - 1)]
         if VERBOSE:
             print("Beta powers: {}".format(beta_powers))
 
-        cyclotomic_cosets = []
-        for coset in full_cyclotomic_cosets:
-            # find all factors beta**i in this coset if element i is inbetween b and b+2t-1
-            for beta_power in beta_powers:
-                if is_bit_set(coset, beta_power):
-                    cyclotomic_cosets.append(coset)
-                    break
+        # only the cosets of the zeroes βⁱ, b <= i <= b+2t-1, in the
+        # order of get_cyclotomic_cosets, {a0} last
+        coset_exponents = []
+        visited = set()
+        for beta_power in beta_powers:
+            if beta_power not in visited:
+                coset = get_cyclotomic_coset(beta_power, power)
+                visited.update(coset)
+                coset_exponents.append(coset)
+        coset_exponents.sort(key=lambda coset: min(coset) or order)
+        cyclotomic_cosets = [exponents_to_bitmask(coset) for coset in coset_exponents]
         if VERBOSE:
             print("Cosets: {}".format("\n".join(binary_to_string(i, False) for i in cyclotomic_cosets)))
 
-        logarithm_table = get_logarithm_table(power=power, primitive_polynomial=primitive_polynomial)
+        field = GaloisField(power=power, primitive_polynomial=primitive_polynomial)
+        minimal_polynomials = [get_polynomial_from_roots(roots=coset, field=field) for coset in coset_exponents]
         generator_polynomial = calculate_generator_polynomial(
-            cyclotomic_cosets=cyclotomic_cosets,
-            logarithm_table=logarithm_table,
+            minimal_polynomials=minimal_polynomials,
             power=power,
             polynomial_count=len(cyclotomic_cosets)
-
         )
         if TEST:
             for beta_power in beta_powers:
-                generator_with_root = check_polynomial_with_root(generator_polynomial, beta_power, logarithm_table)
+                generator_with_root = check_polynomial_with_root(generator_polynomial, beta_power, field)
 
                 if VERBOSE:
                     print("Check generator with root {}: {}".format(beta_power, bin(generator_with_root)[2:]))
@@ -73,35 +210,256 @@ class BCH:
 
         self.primitive_polynomial = primitive_polynomial
         self.cyclotomic_cosets = cyclotomic_cosets
-        self.logarithm_table = logarithm_table
+        self.coset_exponents = coset_exponents
+        self.minimal_polynomials = minimal_polynomials
+        self.field = field
         self.generator_polynomial = generator_polynomial
 
         k = n - msb(generator_polynomial)
+        if k <= 0:
+            raise ValueError("The generator polynomial of degree {} leaves no message bits in n = {}".format(msb(generator_polynomial), n))
         self.k = k
 
+        self.remainder_table = get_remainder_table(generator_polynomial, REMAINDER_TABLE_WIDTH)
+        self._remainder_array = None
+
+        self.root_finder = root_finder
+        self.root_tables = None
+        if root_finder == 'closed_form':
+            if (field.order + 1) * ROOT_TABLE_ENTRY_BYTES > TABLE_MEMORY_BUDGET:
+                if VERBOSE:
+                    print("Root tables exceed the memory budget, using Chien search")
+            else:
+                self.root_tables = get_root_tables(field=field)
+
+        # a row of n elements per syndrome which isn't a square
+        if syndrome_method == 'direct' and get_direct_syndrome_count(t, b) * n * item_size > TABLE_MEMORY_BUDGET:
+            if VERBOSE:
+                print("Syndrome table exceeds the memory budget, using the remainder method")
+            syndrome_method = 'remainder'
+
+        self.syndrome_method = syndrome_method
+        self._syndrome_matrix = None
+        self.syndrome_table = None
+        if syndrome_method == 'direct':
+            self.syndrome_table = get_syndrome_table(field=field, n=n, t=t, b=b)
+
+        self.decoder = decoder
+        self.error_pattern_table = None
+        if decoder == 'lookup':
+            self.error_pattern_table = load_error_pattern_table(
+                path=lookup_table_file,
+                remainder_table=self.remainder_table,
+                generator_polynomial=generator_polynomial,
+                n=n,
+                t=t)
+
         if VERBOSE:
             print("n: {}, d: {}, t: {}, b: {}, power: {}, k: {}".format(n, dist, t, b, power, k))
             print("Generator polynomial: {} ({:b})".format(binary_to_string(generator_polynomial), generator_polynomial))
 
+    def __getstate__(self):
+        # the NumPy tables are rebuilt on demand, a pickled
+        # code loads without NumPy
+        state = self.__dict__.copy()
+        state['_remainder_array'] = None
+        state['_syndrome_matrix'] = None
+        return state
+
     def encode(self, message):
-        return encode(self.generator_polynomial, message)
+        if message >> self.k:
+            raise ValueError("The message of {} bits is wider than k = {} bits".format(message.bit_length(), self.k))
+        return encode_with_table(self.remainder_table, msb(self.generator_polynomial), message, self.k)
+
+    def encode_batch(self, messages):
+        """
+        Encodes many messages at once.
+
+        :param messages: a sequence of integers, or an
+        (N, k) uint8 NumPy matrix of bits, column i being
+        the coefficient of xⁱ.
+
+        :returns: codewords in the same form, an (N, n)
+        matrix for bits.
+
+        Both forms are encoded with NumPy, integers by
+        batch.encode_ints without a bit matrix, unless a
+        remainder and a table lookup don't fit 64 bits.
+
+        :raises: ValueError if a message or a matrix is
+        wider than k bits.
+        """
+        import numpy
+        import batch
+
+        degree = msb(self.generator_polynomial)
+        as_ints = isinstance(messages, (list, tuple))
+        if as_ints:
+            if messages and max(messages) >> self.k:
+                raise ValueError("The message of {} bits is wider than k = {} bits".format(max(messages).bit_length(), self.k))
+            if degree + REMAINDER_TABLE_WIDTH > 64:
+                return [encode_with_table(self.remainder_table, degree, message, self.k) for message in messages]
+            if not messages:
+                return []
+        else:
+            bits = numpy.asarray(messages, dtype=numpy.uint8)
+            if bits.ndim != 2 or bits.shape[1] != self.k:
+                raise ValueError("Expected an (N, {}) matrix of message bits, got {}".format(self.k, bits.shape))
+            if degree + REMAINDER_TABLE_WIDTH > 64:
+                codewords = [encode_with_table(self.remainder_table, degree, message, self.k) for message in batch.bits_to_ints(bits)]
+                return batch.ints_to_bits(codewords, self.n)
+
+        if self._remainder_array is None:
+            self._remainder_array = numpy.array(self.remainder_table, dtype=numpy.uint64)
+        if as_ints:
+            return batch.encode_ints(messages, self.k, self._remainder_array, degree, REMAINDER_TABLE_WIDTH)
+        return batch.encode_batch(bits, self._remainder_array, degree, REMAINDER_TABLE_WIDTH)
 
     def decode_ex(self, message):
-        return decode(self.primitive_polynomial, message, self.cyclotomic_cosets, self.logarithm_table, self.power, self.t, self.n, self.k, self.b)
+        if message >> self.n:
+            raise ValueError("The received word of {} bits is wider than n = {} bits".format(message.bit_length(), self.n))
+        if self.error_pattern_table is not None:
+            return decode_with_lookup(self.remainder_table, msb(self.generator_polynomial), self.error_pattern_table, message, self.n, self.k)
+        return decode(self.primitive_polynomial, message, self.cyclotomic_cosets, self.field, self.power, self.t, self.n, self.k, self.b,
+                      syndrome_table=self.syndrome_table, minimal_polynomials=self.minimal_polynomials,
+                      root_tables=self.root_tables,
+                      remainder_table=self.remainder_table if self.syndrome_method == 'remainder' else None)
 
     def decode(self, message):
-        return decode(self.primitive_polynomial, message, self.cyclotomic_cosets, self.logarithm_table, self.power, self.t, self.n, self.k, self.b)[0]
+        return self.decode_ex(message)[0]
+
+    def get_incremental_syndromes(self, message):
+        """
+        Calculates syndromes of a base word which can
+        be updated by flipping its bits.
+
+        :param message: a base word.
+
+        :returns: an IncrementalSyndromes.
+        """
+        syndrome_table = self.syndrome_table
+        if syndrome_table is None:
+            syndrome_table = get_syndrome_table(self.field, self.n, self.t, self.b)
+        return IncrementalSyndromes(message, syndrome_table, self.field, self.t, self.b)
+
+    def locate_errors(self, syndromes):
+        """
+        Finds the positions of errors from nonzero
+        syndromes, e.g. of IncrementalSyndromes.
+
+        :raises: DecodingFailure if the errors can't
+        be corrected.
+        """
+        return locate_errors(syndromes, self.field, self.power, self.t, self.n, self.b, root_tables=self.root_tables)
+
+    def decode_soft(self, llr_values, flips=CHASE_FLIPS):
+        """
+        Decodes a received word from its LLRs with
+        the Chase-II algorithm.
+
+        :param llr_values: n signed LLRs, the i-th of
+        the coefficient of xⁱ, negative for 1.
+        :param flips: a number of least reliable
+        positions to flip.
+
+        :returns: a decoded message and codeword.
+
+        :raises: ValueError if there are not n LLRs or
+        flips is not between 0 and min(n, MAX_FLIPS).
+        """
+        if len(llr_values) != self.n:
+            raise ValueError("Expected n = {} LLRs, got {}".format(self.n, len(llr_values)))
+        syndrome_table = self.syndrome_table
+        if syndrome_table is None:
+            syndrome_table = get_syndrome_table(self.field, self.n, self.t, self.b)
+        return chase_decode(llr_values, syndrome_table, self.field, self.power, self.t, self.n, self.k, self.b,
+                            flips=flips, root_tables=self.root_tables)
+
+    def decode_batch(self, received):
+        """
+        Decodes many received words at once with NumPy.
+
+        :param received: an (N, n) uint8 matrix of bits,
+        column i being the coefficient of xⁱ, or an
+        (N, ⌈n/64⌉) uint64 matrix of packed words.
+
+        :returns: corrected codewords, messages in the
+        same form as the input, and an array of
+        batch.DECODE_* statuses.
+
+        A code whose float32 syndrome matrix of n rows
+        exceeds TABLE_MEMORY_BUDGET is decoded word by
+        word with decode_ex instead.
+
+        :raises: ValueError if the matrix isn't n bits,
+        or ⌈n/64⌉ words, wide.
+        """
+        import numpy
+        import batch
+
+        received = numpy.asarray(received)
+        packed = received.dtype == numpy.uint64
+        width = -(-self.n // 64) if packed else self.n
+        if received.ndim != 2 or received.shape[1] != width:
+            raise ValueError("Expected an (N, {}) matrix of received {}, got {}".format(width, "words" if packed else "bits", received.shape))
+        bits = batch.packed_to_bits(received, self.n) if packed else received
+
+        if self.n * get_direct_syndrome_count(self.t, self.b) * self.power * 4 > TABLE_MEMORY_BUDGET:
+            codewords, messages, status = self._decode_words(bits)
+        else:
+            if self._syndrome_matrix is None:
+                self._syndrome_matrix = batch.get_syndrome_matrix(self.field, self.n, self.t, self.b)
+            codewords, messages, status = batch.decode_batch(
+                bits, self.field, self._syndrome_matrix, self.t, self.b, self.n, self.k)
+
+        if packed:
+            return batch.bits_to_packed(codewords), batch.bits_to_packed(messages), status
+        return codewords, messages, status
+
+    def _decode_words(self, bits):
+        """
+        decode_batch one word at a time with decode_ex.
+        """
+        import numpy
+        import batch
+
+        count = len(bits)
+        status = numpy.full(count, batch.DECODE_NO_ERRORS, dtype=numpy.int8)
+        codewords = []
+        for index, word in enumerate(batch.bits_to_ints(bits) if count else []):
+            try:
+                _, codeword = self.decode_ex(word)
+            except DecodingFailure:
+                codeword = word
+                status[index] = batch.DECODE_FAILURE
+            else:
+                if codeword != word:
+                    status[index] = batch.DECODE_CORRECTED
+            codewords.append(codeword)
 
-def calculate_generator_polynomial(cyclotomic_cosets, logarithm_table, power, polynomial_count):
+        codewords = batch.ints_to_bits(codewords, self.n) if count else numpy.array(bits, dtype=numpy.uint8)
+        return codewords, codewords[:, self.n - self.k:], status
+
+    def get_syndromes(self, message):
+        """
+        Calculates syndromes of a received message
+        with the method chosen for this code.
+        """
+        if self.syndrome_table is not None:
+            return evaluate_syndromes(message, self.syndrome_table, self.field, self.t, self.b)
+        if self.syndrome_method == 'remainder':
+            return get_remainder_syndromes(message, self.remainder_table, self.n - self.k, self.field, self.t, self.b, self.n)
+        return get_syndromes(self.primitive_polynomial, message, self.cyclotomic_cosets, self.field, self.power, self.t, self.b,
+                             minimal_polynomials=self.minimal_polynomials)
+
+def calculate_generator_polynomial(minimal_polynomials, power, polynomial_count):
     """
     Calculates a generator polynomial of
     a particular BCH code.
     
-    :param cyclotomic_cosets: cyclotomic
-    cosets of primitive roots of a Galois
-    field.
-    :param logarithm_table: a convenient form
-    of the field elements for multiplication.
+    :param minimal_polynomials: minimal
+    polynomials of the cyclotomic cosets
+    of the code.
     :param power: the power in GF(2ᵖᵒʷᵉʳ).
     :param t: a number of errors to correct.
     
@@ -109,16 +467,12 @@ def calculate_generator_polynomial(cyclotomic_cosets, logarithm_table, power, po
     a product of polynomails obtained from
     cyclotomic cosets.
     """
-    generator_polynomial = get_polynomial_from_roots(
-                        roots=cyclotomic_cosets[0],
-                        logarithm_table=logarithm_table)
+    generator_polynomial = minimal_polynomials[0]
                 
     for i in range(1, polynomial_count):
         generator_polynomial = multiply_polynomials(
             polynomial1=generator_polynomial,
-            polynomial2=get_polynomial_from_roots(
-                roots=cyclotomic_cosets[i],
-                logarithm_table=logarithm_table)
+            polynomial2=minimal_polynomials[i]
         )
 
     return generator_polynomial
@@ -141,7 +495,174 @@ def encode(generator_polynomial, message):
     message <<= power
     return message ^ divide_polynomials(polynomial1=message, polynomial2=generator_polynomial)[1]
 
-def decode(primitive_polynomial, received_message, cyclotomic_cosets, logarithm_table, power, t, n, k, b):
+def get_remainder_table(generator_polynomial, width):
+    """
+    Builds a table of remainders vxᵈᵉᵍ ᵍ mod g
+    for every polynomial v of less than width
+    bits, the way table-driven CRCs do.
+
+    :param generator_polynomial: a generator
+    polynomial of the code.
+    :param width: a number of bits consumed
+    per lookup, 8 or 16.
+
+    :returns: a list of 2ʷⁱᵈᵗʰ remainders.
+    """
+    degree = msb(generator_polynomial)
+    table = [0] * (1 << width)
+    for bit in range(width):
+        table[1 << bit] = divide_polynomials(
+            polynomial1=1 << (bit + degree),
+            polynomial2=generator_polynomial)[1]
+    # the remainder is linear in v
+    for v in range(3, 1 << width):
+        lowest = v & -v
+        if v != lowest:
+            table[v] = table[v ^ lowest] ^ table[lowest]
+    return table
+
+def get_shifted_remainder(remainder_table, degree, polynomial, length):
+    """
+    Computes vxᵈᵉᵍ ᵍ mod g a chunk of bits at a
+    time with a table from get_remainder_table.
+
+    :param remainder_table: a table of remainders.
+    :param degree: a degree of the generator
+    polynomial.
+    :param polynomial: a polynomial v.
+    :param length: a number of bits of v.
+
+    :returns: the remainder.
+    """
+    width = msb(len(remainder_table))
+    chunk_mask = len(remainder_table) - 1
+    mask = (1 << degree) - 1
+
+    remainder = 0
+    if width % 8:
+        for shift in range((length - 1) // width * width, -1, -width):
+            remainder = (remainder << width) ^ (((polynomial >> shift) & chunk_mask) << degree)
+            remainder = (remainder & mask) ^ remainder_table[remainder >> degree]
+        return remainder
+
+    # the chunks are read from the bytes of v, shifting a long v
+    # for every chunk would cost O(length) each
+    byte_width = width // 8
+    chunk_count = (length - 1) // width + 1
+    data = (polynomial & ((1 << chunk_count * width) - 1)).to_bytes(chunk_count * byte_width, 'little')
+    for offset in range((chunk_count - 1) * byte_width, -1, -byte_width):
+        chunk = data[offset] if byte_width == 1 else int.from_bytes(data[offset:offset + byte_width], 'little')
+        remainder = (remainder << width) ^ (chunk << degree)
+        remainder = (remainder & mask) ^ remainder_table[remainder >> degree]
+
+    return remainder
+
+def encode_with_table(remainder_table, degree, message, k):
+    """
+    Encodes a message the same way as encode, but
+    computes the remainder a chunk of bits at a time
+    with a table from get_remainder_table.
+
+    :param remainder_table: a table of remainders.
+    :param degree: a degree of the generator
+    polynomial.
+    :param message: a message to encode.
+    :param k: a length of informative part of code.
+
+    :returns: an encoded message.
+    """
+    return (message << degree) | get_shifted_remainder(remainder_table, degree, message, k)
+
+def get_error_pattern_table(remainder_table, generator_polynomial, n, t):
+    """
+    Builds a table of all correctable error patterns,
+    i.e. of weight up to t, indexed by their remainders
+    exᵈᵉᵍ ᵍ mod g. The remainder of a received word
+    depends only on its error pattern.
+
+    :param remainder_table: a table of remainders.
+    :param generator_polynomial: a generator
+    polynomial of the code.
+    :param n: a length of code.
+    :param t: a number of errors to correct.
+
+    :returns: a list of 2ᵈᵉᵍ ᵍ error patterns, -1 for
+    remainders of uncorrectable errors.
+
+    :raises: ValueError if the code has more than
+    LOOKUP_MAX_PARITY_BITS parity bits.
+    """
+    degree = msb(generator_polynomial)
+    if degree > LOOKUP_MAX_PARITY_BITS:
+        raise ValueError("A lookup table of 2^{} syndromes is too large, at most 2^{} are allowed".format(degree, LOOKUP_MAX_PARITY_BITS))
+
+    remainders = [get_shifted_remainder(remainder_table, degree, 1 << position, n) for position in range(n)]
+
+    table = [-1] * (1 << degree)
+    table[0] = 0
+    for weight in range(1, t + 1):
+        for positions in combinations(range(n), weight):
+            remainder = 0
+            pattern = 0
+            for position in positions:
+                remainder ^= remainders[position]
+                pattern |= 1 << position
+            table[remainder] = pattern
+    return table
+
+def load_error_pattern_table(path, remainder_table, generator_polynomial, n, t):
+    """
+    Loads a table of error patterns from a file,
+    or builds it with get_error_pattern_table and
+    saves it there. A file of another code is
+    rebuilt.
+
+    :param path: a path to the file or None to
+    only build the table.
+
+    :returns: the table of error patterns.
+    """
+    key = (n, t, generator_polynomial)
+    if path is not None and os.path.exists(path):
+        with open(path, 'rb') as f:
+            saved_key, table = pickle.load(f)
+        if saved_key == key:
+            return table
+
+    table = get_error_pattern_table(remainder_table, generator_polynomial, n, t)
+    if path is not None:
+        with open(path, 'wb') as f:
+            pickle.dump((key, table), f, protocol=2)
+    return table
+
+def decode_with_lookup(remainder_table, degree, error_pattern_table, received_message, n, k):
+    """
+    Decodes a received message with one remainder
+    computation and one lookup of the error pattern.
+
+    :param remainder_table: a table of remainders.
+    :param degree: a degree of the generator
+    polynomial.
+    :param error_pattern_table: a table from
+    get_error_pattern_table.
+    :param received_message: a message is
+    to be decoded.
+    :param n: a length of code.
+    :param k: a length of informative part of code.
+
+    :returns: a decoded message and status.
+
+    :raises: DecodingFailure if the errors can't
+    be corrected.
+    """
+    pattern = error_pattern_table[get_shifted_remainder(remainder_table, degree, received_message, n)]
+    if pattern < 0:
+        raise DecodingFailure("The syndrome doesn't belong to an error of weight up to t")
+    received_message ^= pattern
+    return received_message >> (n - k), received_message
+
+def decode(primitive_polynomial, received_message, cyclotomic_cosets, field, power, t, n, k, b, syndrome_table=None, minimal_polynomials=None,
+           root_tables=None, remainder_table=None):
     """
     Decodes a received message.
     
@@ -152,9 +673,7 @@ def decode(primitive_polynomial, received_message, cyclotomic_cosets, logarithm_
     :param cyclotomic_cosets: cyclotomic
     cosets of primitive roots of a Galois
     field.
-    :param logarithm_table: a mapping from
-    the power of a primitive element of a Galois
-    field to this element.
+    :param field: the Galois field GF(2ᵖᵒʷᵉʳ).
     :param power: the power in the Galois field
     G(2ᵖᵒʷᵉʳ).
     :param t: a number of errors to be corrected.
@@ -162,34 +681,65 @@ def decode(primitive_polynomial, received_message, cyclotomic_cosets, logarithm_
     :param k: a length of informative part of code.
     :param b: a power of element from witch we choose
     cyclotomic cosets for generator polynomial. 
+    :param syndrome_table: powers of the zeroes of
+    the code from get_syndrome_table. If given, the
+    syndromes are evaluated directly instead of
+    dividing by minimal polynomials.
+    :param minimal_polynomials: minimal polynomials
+    of the cyclotomic cosets, computed once per code.
+    :param root_tables: tables from get_root_tables. If
+    given, error locator polynomials of degree up to 4
+    are solved in closed form instead of Chien search.
+    :param remainder_table: a table from
+    get_remainder_table. If given without a syndrome
+    table, the syndromes are evaluated on the
+    remainder of the received message by g.
 
     :returns: a decoded message and status.
+
+    :raises: DecodingFailure if the errors can't
+    be corrected.
     """
-    syndromes, is_error = get_syndromes(
-        primitive_polynomial=primitive_polynomial,
-        received_message=received_message,
-        cyclotomic_cosets=cyclotomic_cosets,
-        logarithm_table=logarithm_table,
-        power=power,
-        t=t,
-        b=b)
+    if syndrome_table is not None:
+        syndromes, is_error = evaluate_syndromes(
+            received_message=received_message,
+            syndrome_table=syndrome_table,
+            field=field,
+            t=t,
+            b=b)
+    elif remainder_table is not None:
+        syndromes, is_error = get_remainder_syndromes(
+            received_message=received_message,
+            remainder_table=remainder_table,
+            degree=n - k,
+            field=field,
+            t=t,
+            b=b,
+            n=n)
+    else:
+        syndromes, is_error = get_syndromes(
+            primitive_polynomial=primitive_polynomial,
+            received_message=received_message,
+            cyclotomic_cosets=cyclotomic_cosets,
+            field=field,
+            power=power,
+            t=t,
+            b=b,
+            minimal_polynomials=minimal_polynomials)
     
     if not is_error:
         if VERBOSE:
             print("Message has no errors")
     else:
-        sigma = berlekamp_massey_decode(
+        error_positions = locate_errors(
             syndromes=syndromes,
-            logarithm_table=logarithm_table,
+            field=field,
             power=power,
-            t=t)
+            t=t,
+            n=n,
+            b=b,
+            root_tables=root_tables)
 
-        roots = find_roots_of_sigma(
-            sigma=sigma,
-            power=power,
-            logarithm_table=logarithm_table)
-
-        error_positions = get_error_positions(roots=roots, power=power)
         for position in error_positions:
             if VERBOSE:
                 print("Error in position {}".format(position))
@@ -198,7 +748,152 @@ def decode(primitive_polynomial, received_message, cyclotomic_cosets, logarithm_
     decoded_message = received_message >> (n - k)
     return decoded_message, received_message
 
-def get_syndromes(primitive_polynomial, received_message, cyclotomic_cosets, logarithm_table, power, t, b):
+def locate_errors(syndromes, field, power, t, n, b, root_tables=None):
+    """
+    Finds the positions of errors from nonzero
+    syndromes with Berlekamp-Massey and a root
+    finder.
+
+    :param syndromes: a list of powers of a primitive
+    element a, -1 for zero, as from get_syndromes.
+    :param field: the Galois field GF(2ᵖᵒʷᵉʳ).
+    :param power: the power in the Galois field
+    G(2ᵖᵒʷᵉʳ).
+    :param t: a number of errors to be corrected.
+    :param n: a length of code.
+    :param b: a power of element from witch we choose
+    cyclotomic cosets for generator polynomial.
+    :param root_tables: tables from get_root_tables. If
+    given, error locator polynomials of degree up to 4
+    are solved in closed form instead of Chien search.
+
+    :returns: a list of error positions.
+
+    :raises: DecodingFailure if the errors can't
+    be corrected.
+    """
+    sigma = inversion_free_berlekamp_massey_decode(
+        syndromes=syndromes,
+        field=field,
+        t=t,
+        b=b)
+
+    if TEST:
+        assert sigma == berlekamp_massey_decode(syndromes=syndromes, field=field, power=power, t=t), \
+            "Inversion-free Berlekamp-Massey differs from Berlekamp-Massey"
+
+    if get_order_of_sigma(sigma=sigma) > t:
+        raise DecodingFailure("The error locator polynomial is of degree {} > t = {}".format(get_order_of_sigma(sigma=sigma), t))
+
+    if root_tables is not None:
+        roots = solve_error_locator(
+            sigma=sigma,
+            field=field,
+            n=n,
+            root_tables=root_tables)
+    else:
+        roots = chien_search(
+            sigma=sigma,
+            field=field,
+            n=n)
+
+    error_positions = get_error_positions(roots=roots, power=power)
+
+    # σ may have deg σ roots and still be shorter than the
+    # register Berlekamp-Massey needed, then the flipped
+    # bits don't cancel the syndromes
+    for index, syndrome in enumerate(syndromes):
+        value = field.element(syndrome)
+        for position in error_positions:
+            value ^= field.exp[((b + index) * position) % field.order]
+        if value:
+            raise DecodingFailure("Error positions {} don't match the syndromes".format(error_positions))
+
+    return error_positions
+
+def chase_decode(llr_values, syndrome_table, field, power, t, n, k, b, flips=CHASE_FLIPS, root_tables=None):
+    """
+    Chase-II soft-decision decoding. Every
+    combination of the least reliable positions of
+    the hard decision is flipped and decoded, the
+    candidate with the smallest correlation
+    discrepancy, the sum of |LLR| over the bits it
+    changes, wins. Test patterns are visited in Gray
+    code order, so each one updates the syndromes of
+    the previous one by a single flip of
+    IncrementalSyndromes.
+
+    :param llr_values: n signed LLRs, the i-th of the
+    coefficient of xⁱ, negative for 1.
+    :param syndrome_table: a table from
+    get_syndrome_table.
+    :param field: the Galois field GF(2ᵖᵒʷᵉʳ).
+    :param power: the power in the Galois field
+    G(2ᵖᵒʷᵉʳ).
+    :param t: a number of errors to be corrected.
+    :param n: a length of code.
+    :param k: a length of informative part of code.
+    :param b: a power of element from witch we choose
+    cyclotomic cosets for generator polynomial.
+    :param flips: a number of least reliable
+    positions to flip.
+    :param root_tables: tables from get_root_tables.
+
+    :returns: a decoded message and codeword.
+
+    :raises: ValueError if flips is not between 0
+    and min(n, MAX_FLIPS), DecodingFailure if no test
+    pattern can be decoded.
+    """
+    if not 0 <= flips <= min(n, MAX_FLIPS):
+        raise ValueError("The number of flips {} is not between 0 and {}".format(flips, min(n, MAX_FLIPS)))
+
+    hard_decision = 0
+    reliabilities = []
+    for position, llr in enumerate(llr_values):
+        if llr < 0:
+            hard_decision |= 1 << position
+        reliabilities.append(abs(llr))
+    least_reliable = sorted(range(n), key=reliabilities.__getitem__)[:flips]
+
+    syndromes = IncrementalSyndromes(hard_decision, syndrome_table, field, t, b)
+
+    best_discrepancy = None
+    best_errors = 0
+    for test in range(1 << len(least_reliable)):
+        if test:
+            syndromes.flip([least_reliable[(test & -test).bit_length() - 1]])
+
+        errors = syndromes.received_message ^ hard_decision
+        if syndromes.is_error:
+            try:
+                error_positions = locate_errors(
+                    syndromes=syndromes.syndromes,
+                    field=field,
+                    power=power,
+                    t=t,
+                    n=n,
+                    b=b,
+                    root_tables=root_tables)
+            except DecodingFailure:
+                continue
+            for position in error_positions:
+                errors ^= 1 << position
+
+        discrepancy = 0
+        for position in get_positions_of_binary_ones(errors):
+            discrepancy += reliabilities[position]
+        if best_discrepancy is None or discrepancy < best_discrepancy:
+            best_discrepancy = discrepancy
+            best_errors = errors
+
+    if best_discrepancy is None:
+        raise DecodingFailure("None of {} test patterns can be decoded".format(1 << len(least_reliable)))
+
+    codeword = hard_decision ^ best_errors
+    return codeword >> (n - k), codeword
+
+def get_syndromes(primitive_polynomial, received_message, cyclotomic_cosets, field, power, t, b, minimal_polynomials=None):
     """
     Calculates syndromes as values of received
     message at zeroes of generator polynomial,
@@ -210,12 +905,14 @@ def get_syndromes(primitive_polynomial, received_message, cyclotomic_cosets, log
     was received by the decoder.
     :param cyclotomic_cosets: cyclotomic cosets
     for building minimal polynomials.
-    :param logarithm_table: a convenient form
-    of the field elements for multiplication.
+    :param field: the Galois field GF(2ᵖᵒʷᵉʳ).
     :param power: the power in GF(2ᵖᵒʷᵉʳ).
     :param t: a number of errors to correct.
     :param b: a power of element from witch we choose
     cyclotomic cosets for generator polynomial. 
+    :param minimal_polynomials: minimal polynomials
+    of the cyclotomic cosets. If not given, they are
+    built from the cosets.
 
     :returns: a list of powers of a primitive
     element a as shortcuts for polynomials.
@@ -225,18 +922,17 @@ def get_syndromes(primitive_polynomial, received_message, cyclotomic_cosets, log
 
     beta_powers = [i % (2 ** power - 1) for i in range(b, b + (2 * t))]
 
-    flipped_logarithm_table = flip_dictionary(dictionary=logarithm_table)
-    
+    if minimal_polynomials is None:
+        minimal_polynomials = [get_polynomial_from_roots(roots=coset, field=field) for coset in cyclotomic_cosets]
+
     for i in beta_powers:
         syndrome_polynomial = received_message
 
-        for coset in cyclotomic_cosets:
+        for index, coset in enumerate(cyclotomic_cosets):
             if is_bit_set(coset, i):
                 syndrome_polynomial = divide_polynomials(
                     polynomial1=syndrome_polynomial,
-                    polynomial2=get_polynomial_from_roots(
-                        roots=coset,
-                        logarithm_table=logarithm_table)
+                    polynomial2=minimal_polynomials[index]
                 )[1]
                 break
 
@@ -250,7 +946,7 @@ def get_syndromes(primitive_polynomial, received_message, cyclotomic_cosets, log
                 polynomial2=primitive_polynomial
             )[1]
 
-        syndrome = flipped_logarithm_table[syndrome_polynomial_of_argument_to_power]
+        syndrome = field.logarithm(syndrome_polynomial_of_argument_to_power)
 
         if syndrome != -1:
             is_error = True
@@ -259,7 +955,136 @@ def get_syndromes(primitive_polynomial, received_message, cyclotomic_cosets, log
         
     return syndromes, is_error
 
-def berlekamp_massey_decode(syndromes, logarithm_table, power, t):
+def is_square_syndrome(j, b):
+    """
+    Checks if the syndrome Sⱼ of a binary word is
+    the square of a previous one, S₂ᵢ = Sᵢ² with
+    b ≤ i < j.
+    """
+    return j > 0 and j % 2 == 0 and j // 2 >= b
+
+def get_direct_syndrome_count(t, b):
+    """
+    Number of the syndromes Sⱼ, j = b .. b + 2t - 1,
+    which aren't squares of previous ones.
+    """
+    return sum(1 for j in range(b, b + 2 * t) if not is_square_syndrome(j, b))
+
+def get_syndrome_table(field, n, t, b):
+    """
+    Precomputes the powers αʲⁱ of the zeroes
+    αʲ of a code, j = b .. b + 2t - 1, for every
+    position i of a codeword.
+
+    For a binary word S₂ⱼ = Sⱼ², so a row is
+    only built for an exponent which can't be
+    obtained by squaring another syndrome.
+
+    :param field: the Galois field GF(2ᵖᵒʷᵉʳ).
+    :param n: a length of code.
+    :param t: a number of errors to correct.
+    :param b: a power of element from witch we choose
+    cyclotomic cosets for generator polynomial.
+
+    :returns: a list with a row of n field elements
+    per syndrome, or None where the syndrome is a
+    square of a previous one.
+    """
+    table = []
+    for j in range(b, b + 2 * t):
+        if is_square_syndrome(j, b):
+            table.append(None)
+            continue
+
+        table.append(field.powers(j, n))
+    return table
+
+def evaluate_syndromes(received_message, syndrome_table, field, t, b):
+    """
+    Calculates syndromes Sⱼ = r(αʲ) as a sum of
+    precomputed powers αʲⁱ over the set bits i of
+    the received message. Syndromes without a row
+    in the table are squares of the previous ones.
+
+    :param received_message: a message which
+    was received by the decoder.
+    :param syndrome_table: a table from
+    get_syndrome_table.
+    :param field: the Galois field GF(2ᵖᵒʷᵉʳ).
+    :param t: a number of errors to correct.
+    :param b: a power of element from witch we choose
+    cyclotomic cosets for generator polynomial.
+
+    :returns: a list of powers of a primitive
+    element a as shortcuts for polynomials, the
+    same as get_syndromes.
+    """
+    positions = get_positions_of_binary_ones(received_message)
+
+    values = []
+    for index in range(2 * t):
+        row = syndrome_table[index]
+        if row is None:
+            root = values[(b + index) // 2 - b]
+            value = field.mul(root, root)
+        else:
+            value = 0
+            for i in positions:
+                value ^= row[i]
+        values.append(value)
+
+    syndromes = [field.logarithm(value) for value in values]
+    return syndromes, any(values)
+
+def get_remainder_syndromes(received_message, remainder_table, degree, field, t, b, n):
+    """
+    Calculates syndromes on the remainder of the
+    received message by the generator polynomial:
+    the zeroes αʲ of the code are roots of g, so
+    r(αʲ) = (r mod g)(αʲ) and only deg g bits are
+    evaluated. The remainder is computed a chunk of
+    bits at a time, as by the encoder, without any
+    table of n elements.
+
+    :param received_message: a message which
+    was received by the decoder.
+    :param remainder_table: a table from
+    get_remainder_table.
+    :param degree: a degree of the generator
+    polynomial.
+    :param field: the Galois field GF(2ᵖᵒʷᵉʳ).
+    :param t: a number of errors to correct.
+    :param b: a power of element from witch we choose
+    cyclotomic cosets for generator polynomial.
+    :param n: a length of code.
+
+    :returns: a list of powers of a primitive
+    element a as shortcuts for polynomials, the
+    same as get_syndromes.
+    """
+    # r = hxᵈᵉᵍ ᵍ + l, so r mod g = (hxᵈᵉᵍ ᵍ mod g) + l
+    remainder = get_shifted_remainder(remainder_table, degree, received_message >> degree, n - degree)
+    remainder ^= received_message & ((1 << degree) - 1)
+    positions = get_positions_of_binary_ones(remainder)
+
+    exp = field.exp
+    order = field.order
+    values = []
+    for j in range(b, b + 2 * t):
+        if is_square_syndrome(j, b):
+            root = values[j // 2 - b]
+            value = field.mul(root, root)
+        else:
+            value = 0
+            step = j % order
+            for i in positions:
+                value ^= exp[i * step % order]
+        values.append(value)
+
+    syndromes = [field.logarithm(value) for value in values]
+    return syndromes, any(values)
+
+def berlekamp_massey_decode(syndromes, field, power, t):
     """
     Calculates an error locator polynomial using
     the Berlekamp-Massey algorithm.
@@ -267,9 +1092,7 @@ def berlekamp_massey_decode(syndromes, logarithm_table, power, t):
     :param syndromes: a calculated array of
     syndromes corresponding to the received
     message with error vector.
-    :param logarithm_table: a mapping of a
-    power to a corresponding element of a particular
-    Galois field.
+    :param field: the Galois field GF(2ᵖᵒʷᵉʳ).
     :param power: the power in a Galois field GF(2ᵖᵒʷᵉʳ).
     :param t: a number of error to be corrected.
     
@@ -283,8 +1106,7 @@ def berlekamp_massey_decode(syndromes, logarithm_table, power, t):
     In these cells the powers of α are stored.
     """
     
-    flipped_logarithm_table = flip_dictionary(dictionary=logarithm_table)
-    number_of_elements = 2 ** power - 1
+    syndromes = [field.element(syndrome) for syndrome in syndromes]
     
     C = [0] * (2 * t) # error locator polynomial
     C[0] = 1
@@ -298,14 +1120,7 @@ def berlekamp_massey_decode(syndromes, logarithm_table, power, t):
         # ∆ (delta)
         delta = 0
         for i in range(0, L + 1):
-            if not (C[i] and logarithm_table[syndromes[n - i]]):
-                # one of the factors is zero
-                continue
-
-            C_idx = flipped_logarithm_table[C[i]]
-            s_idx = syndromes[n - i]
-            mult = (C_idx + s_idx) % number_of_elements
-            delta ^= logarithm_table[mult] 
+            delta ^= field.mul(C[i], syndromes[n - i])
 
         if VERBOSE:
             print("\nn: {}, delta: {}".format(n, delta))
@@ -317,38 +1132,330 @@ def berlekamp_massey_decode(syndromes, logarithm_table, power, t):
             # L not updates
             pass
         else:
-            T = copy.deepcopy(C) # temporary polinomial
+            T = C[:] # temporary polinomial
 
             for i in range(len(C)):
-                b_idx = flipped_logarithm_table[B[i]]
-                delta_idx = flipped_logarithm_table[delta]
-                if b_idx != -1:
-                    mult = (b_idx + delta_idx) % number_of_elements
-                    T[i] ^= logarithm_table[mult]
+                T[i] ^= field.mul(B[i], delta)
 
             if 2 * L <= n:
                 # L updates, nullify delta
 
                 for i in range(len(C)):
-                    B[i] = 0
-                    delta_idx = number_of_elements - flipped_logarithm_table[delta]
-                    C_idx = flipped_logarithm_table[C[i]]
-                    if C_idx != -1:
-                        div = (C_idx + delta_idx) % number_of_elements
-                        B[i] = logarithm_table[div]
+                    B[i] = field.div(C[i], delta)
 
-                C = copy.deepcopy(T)
+                C = T
 
                 L = n + 1 - L
             else:
-                C = copy.deepcopy(T)
+                C = T
 
     result = []
     for poly in C:
-        result.append(flipped_logarithm_table[poly])
+        result.append(field.logarithm(poly))
     return result
 
-def find_roots_of_sigma(sigma, power, logarithm_table):
+def inversion_free_berlekamp_massey_decode(syndromes, field, t, b=1):
+    """
+    Calculates an error locator polynomial using
+    the inversion-free Berlekamp-Massey algorithm:
+    instead of dividing by the discrepancy δ, the
+    polynomial is scaled by the discrepancy γ of
+    the last length change,
+        Λ(x) = γΛ(x) + δxB(x),
+    and the sign of k tells when the length changes.
+
+    For a narrow-sense binary code (b = 1) every odd
+    discrepancy is zero because S₂ⱼ = Sⱼ², so a pair
+    of steps is done in one and there are only t
+    iterations.
+
+    :param syndromes: a calculated array of
+    syndromes corresponding to the received
+    message with error vector.
+    :param field: the Galois field GF(2ᵖᵒʷᵉʳ).
+    :param t: a number of error to be corrected.
+    :param b: a power of element from witch we choose
+    cyclotomic cosets for generator polynomial.
+
+    :returns: an array representing an error locator
+    polynomial, the same as berlekamp_massey_decode.
+    """
+    mul = field.mul
+    syndromes = [field.element(syndrome) for syndrome in syndromes]
+    length = 2 * t
+    step = 2 if b == 1 else 1
+
+    Lambda = [1] + [0] * (length - 1)
+    B = [0, 1] + [0] * (length - 2) # xB(x) of the algorithm
+    gamma = 1
+    k = 0
+
+    for r in range(0, 2 * t, step):
+        delta = 0
+        for i in range(min(r, length - 1) + 1):
+            if Lambda[i]:
+                delta ^= mul(Lambda[i], syndromes[r - i])
+
+        if VERBOSE:
+            print("\nr: {}, delta: {}, gamma: {}, k: {}".format(r, delta, gamma, k))
+
+        # Λ = γΛ + δxB, both are of degree at most r + 2
+        top = min(length, r + 3)
+        updated = [mul(gamma, Lambda[i]) ^ mul(delta, B[i]) for i in range(top)] + [0] * (length - top)
+
+        if delta and k >= 0:
+            B = [0] + Lambda[:length - 1]
+            gamma = delta
+            k = -k - 1
+        else:
+            B = [0] + B[:length - 1]
+            k += 1
+        Lambda = updated
+
+        if step == 2:
+            # the next discrepancy is zero: B = xB, k = k + 1
+            B = [0] + B[:length - 1]
+            k += 1
+
+    normalization = field.inv(Lambda[0])
+    return [field.logarithm(mul(coefficient, normalization)) for coefficient in Lambda]
+
+def chien_search(sigma, field, n):
+    """
+    Chien algorithm over the n positions of a
+    codeword only. Every term σₖxᵏ of the error
+    locator polynomial is kept in a register that
+    is multiplied by α⁻ᵏ when moving to the next
+    position, so σ(α⁻ⁱ) is a sum of the registers.
+    The search stops when deg σ roots are found.
+
+    :param sigma: a sigma is an array representing
+    an error locator polynomial.
+    :param field: the Galois field GF(2ᵖᵒʷᵉʳ).
+    :param n: a length of code.
+
+    :returns: an array of roots of a sigma, the same
+    as find_roots_of_sigma.
+
+    :raises: DecodingFailure if there are less than
+    deg σ roots among the positions.
+    """
+    order = field.order
+    degree = get_order_of_sigma(sigma=sigma)
+    exp = field.exp
+
+    if n >= CHIEN_VECTORIZED_LENGTH:
+        roots = chien_search_vectorized(sigma, field, n)
+        if roots is not None:
+            if len(roots) != degree:
+                raise DecodingFailure("Found {} roots of an error locator polynomial of degree {}".format(len(roots), degree))
+            return roots
+
+    terms = [k for k in range(1, degree + 1) if sigma[k] >= 0]
+    registers = [sigma[k] for k in terms]
+    constant = field.element(sigma[0])
+
+    roots = []
+    for position in range(n):
+        result = constant
+        for index in range(len(terms)):
+            result ^= exp[registers[index]]
+        if result == 0:
+            roots.append((order - position) % order)
+            if len(roots) == degree:
+                return roots
+        for index in range(len(terms)):
+            registers[index] -= terms[index]
+            if registers[index] < 0:
+                registers[index] += order
+
+    if len(roots) != degree:
+        raise DecodingFailure("Found {} roots of an error locator polynomial of degree {}".format(len(roots), degree))
+    return roots
+
+def chien_search_vectorized(sigma, field, n):
+    """
+    Evaluates σ(α⁻ⁱ) at all n positions at once with
+    NumPy, a term σₖα⁻ⁱᵏ per array operation.
+
+    :returns: the roots in the order of chien_search,
+    or None without NumPy.
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+
+    order = field.order
+    exp = field.exp_array
+    positions = numpy.arange(n, dtype=numpy.int64)
+    values = numpy.full(n, field.element(sigma[0]), dtype=numpy.int64)
+    for k in range(1, len(sigma)):
+        if sigma[k] >= 0:
+            values ^= exp[(sigma[k] - k * positions) % order]
+    return [(order - position) % order for position in numpy.flatnonzero(values == 0).tolist()]
+
+def get_root_tables(field):
+    """
+    Precomputes solutions of y² + y = c and
+    w³ + w = d for every element c and d of a
+    field, used to solve error locator polynomials
+    of low degree in closed form.
+
+    :param field: the Galois field GF(2ᵖᵒʷᵉʳ).
+
+    :returns: a list with a root y of y² + y = c
+    (the other one is y + 1) or -1 for every c, and
+    a list with a tuple of roots of w³ + w = d for
+    every d.
+    """
+    quadratic = [-1] * (field.order + 1)
+    cubic = [()] * (field.order + 1)
+    for y in range(field.order + 1):
+        square = field.mul(y, y)
+        quadratic[square ^ y] = y
+        d = field.mul(square, y) ^ y
+        cubic[d] = cubic[d] + (y,)
+    return quadratic, cubic
+
+def solve_affine(field, coefficients, target):
+    """
+    Solves an affine equation x⁴ + px² + qx = r.
+    Its left part is linear over GF(2), so the
+    equation is a linear system of power bits.
+
+    :param field: the Galois field GF(2ᵖᵒʷᵉʳ).
+    :param coefficients: a tuple (p, q).
+    :param target: the right part r.
+
+    :returns: a list of all solutions.
+    """
+    p, q = coefficients
+    pivots = {} # leading bit -> (column, combination of basis elements)
+    kernel = []
+    for i in range(field.power):
+        x = 1 << i # αⁱ in the polynomial basis
+        square = field.mul(x, x)
+        column = field.mul(square, square) ^ field.mul(p, square) ^ field.mul(q, x)
+        combination = x
+        while column:
+            leading = column.bit_length() - 1
+            if leading not in pivots:
+                pivots[leading] = column, combination
+                break
+            column ^= pivots[leading][0]
+            combination ^= pivots[leading][1]
+        else:
+            kernel.append(combination)
+
+    solution = 0
+    while target:
+        leading = target.bit_length() - 1
+        if leading not in pivots:
+            return []
+        target ^= pivots[leading][0]
+        solution ^= pivots[leading][1]
+
+    solutions = [solution]
+    for vector in kernel:
+        solutions += [s ^ vector for s in solutions]
+    return solutions
+
+def solve_cubic(field, a, b, c, cubic):
+    """
+    Finds roots of x³ + ax² + bx + c. The substitution
+    x = z + a gives z³ + pz + q, and z = √p·w turns it
+    into w³ + w = q / p³ᐟ², which is looked up.
+
+    :returns: a list of roots.
+    """
+    p = field.mul(a, a) ^ b
+    q = field.mul(a, b) ^ c
+    if p == 0:
+        # z³ = q
+        if q == 0:
+            return [a]
+        logarithm = field.log[q]
+        order = field.order
+        if order % 3:
+            # cubing is a bijection, 3 is inverted modulo the order
+            inverse = (order + 1) // 3 if order % 3 == 2 else (2 * order + 1) // 3
+            return [field.exp[(logarithm * inverse) % order] ^ a]
+        if logarithm % 3:
+            return []
+        return [field.exp[logarithm // 3 + i * order // 3] ^ a for i in range(3)]
+
+    root = field.sqrt(p)
+    d = field.div(q, field.mul(root, p))
+    return [field.mul(root, w) ^ a for w in cubic[d]]
+
+def solve_error_locator(sigma, field, n, root_tables):
+    """
+    Finds roots of an error locator polynomial of
+    degree up to 4 with table lookups and a small
+    linear system instead of Chien search. The roots
+    of the reversed polynomial xᴸ + σ₁xᴸ⁻¹ + ... + σᴸ
+    are the error locators αᵖᵒˢⁱᵗⁱᵒⁿ themselves.
+    Higher degrees are passed to chien_search.
+
+    :param sigma: a sigma is an array representing
+    an error locator polynomial.
+    :param field: the Galois field GF(2ᵖᵒʷᵉʳ).
+    :param n: a length of code.
+    :param root_tables: tables from get_root_tables.
+
+    :returns: an array of roots of a sigma, the same
+    as find_roots_of_sigma.
+
+    :raises: DecodingFailure if there are less than
+    deg σ distinct roots among the positions.
+    """
+    degree = get_order_of_sigma(sigma=sigma)
+    if degree > 4:
+        return chien_search(sigma=sigma, field=field, n=n)
+
+    quadratic, cubic = root_tables
+    coefficients = [field.element(sigma[i]) for i in range(1, degree + 1)] + [0] * (4 - degree)
+    a, b, c, d = coefficients
+
+    if degree == 0:
+        locators = []
+    elif degree == 1:
+        locators = [a]
+    elif degree == 2:
+        locators = []
+        if a != 0:
+            y = quadratic[field.div(b, field.mul(a, a))]
+            if y >= 0:
+                locators = [field.mul(a, y), field.mul(a, y ^ 1)]
+    elif degree == 3:
+        locators = solve_cubic(field, a, b, c, cubic)
+    elif a == 0:
+        locators = solve_affine(field, (b, c), d)
+    else:
+        # x = y + e with e² = c/a removes the linear term
+        e = field.sqrt(field.div(c, a))
+        square = field.mul(e, e)
+        value = field.mul(square, square) ^ field.mul(a, field.mul(square, e)) ^ field.mul(b, square) ^ field.mul(c, e) ^ d
+        if value == 0:
+            # e is a root, the rest are roots of the quotient by x + e
+            quotient_b = a ^ e
+            quotient_c = b ^ field.mul(e, quotient_b)
+            quotient_d = c ^ field.mul(e, quotient_c)
+            locators = [e] + solve_cubic(field, quotient_b, quotient_c, quotient_d, cubic)
+        else:
+            # y = 1/z gives z⁴ + (ae + b)/D·z² + a/D·z = 1/D
+            p = field.div(field.mul(a, e) ^ b, value)
+            q = field.div(a, value)
+            locators = [field.inv(z) ^ e for z in solve_affine(field, (p, q), field.inv(value)) if z]
+
+    order = field.order
+    positions = set(field.log[x] for x in locators if x)
+    if len(positions) != degree or any(position >= n for position in positions):
+        raise DecodingFailure("Found {} roots of an error locator polynomial of degree {}".format(len(positions), degree))
+    return [(order - position) % order for position in positions]
+
+def find_roots_of_sigma(sigma, power, field):
     """
     Tries all the elements of a field to solve an
     error polynomial equls to zero. Chien algorithm.
@@ -356,18 +1463,16 @@ def find_roots_of_sigma(sigma, power, logarithm_table):
     :param sigma: a sigma is an array representing
     an error locator polynomial.
     :param power: the power in a Galois field GF(2ᵖᵒʷᵉʳ).
-    :param logarithm_table: a mapping of a power
-    to a corresponding element of a particular
-    Galois field.
+    :param field: the Galois field GF(2ᵖᵒʷᵉʳ).
     
     :returns: an array of roots of a sigma.
     """
     roots = []
     for candidate in range(2 ** power - 1):
-        result = logarithm_table[sigma[0]]
+        result = field.element(sigma[0])
         for polynomial_power in range(1, get_order_of_sigma(sigma=sigma) + 1):
             if sigma[polynomial_power] >= 0:
-                result ^= logarithm_table[(sigma[polynomial_power] + candidate * polynomial_power) % (2 ** power - 1)]
+                result ^= field.exp[(sigma[polynomial_power] + candidate * polynomial_power) % field.order]
         if result == 0:
             roots.append(candidate)
     return roots
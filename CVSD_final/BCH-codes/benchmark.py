@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+#-*- coding: utf-8 -*-
+
+"""
+Micro-benchmarks of the encoder and the decoder stages.
+
+Usage: python3 benchmark.py <benchmark> [--count N]
+"""
+
+import time
+import random
+import argparse
+
+from bch import *
+
+def measure(function, arguments):
+    """
+    Calls a function for every argument.
+
+    :param function: a function of one argument.
+    :param arguments: a list of arguments.
+
+    :returns: an average time of a call in microseconds.
+    """
+    start = time.perf_counter()
+    for argument in arguments:
+        function(argument)
+    return (time.perf_counter() - start) / len(arguments) * 1e6
+
+def benchmark_root_finders(count):
+    """
+    Compares Chien search with the closed-form
+    root finder on the (1023, 983) code for every
+    number of errors from 1 to t = 4.
+    """
+    bch = BCH(1023, 9, 1, get_primitive_polynomial(10), root_finder='closed_form')
+    print("(1023, 983) BCH, {} error locator polynomials per row".format(count))
+    print("errors │ chien, us │ closed form, us │ speedup")
+
+    for errors in range(1, bch.t + 1):
+        sigmas = []
+        for _ in range(count):
+            codeword = bch.encode(random.getrandbits(bch.k))
+            received = codeword ^ get_random_number_of_hamming_weight(length=bch.n, weight=errors)
+            syndromes, _ = bch.get_syndromes(received)
+            sigmas.append(berlekamp_massey_decode(syndromes=syndromes, field=bch.field, power=bch.power, t=bch.t))
+
+        chien = measure(lambda sigma: chien_search(sigma=sigma, field=bch.field, n=bch.n), sigmas)
+        closed_form = measure(lambda sigma: solve_error_locator(sigma=sigma, field=bch.field, n=bch.n, root_tables=bch.root_tables), sigmas)
+        print("{:>6} │ {:>9.1f} │ {:>15.1f} │ {:>6.1f}x".format(errors, chien, closed_form, chien / closed_form))
+
+def benchmark_lookup_decoder(count):
+    """
+    Compares the algebraic decoder with the lookup
+    decoder on the (255, 239) code for every number
+    of errors from 0 to t = 2.
+    """
+    algebraic = BCH(255, 5, 1, get_primitive_polynomial(8), root_finder='closed_form')
+    lookup = BCH(255, 5, 1, get_primitive_polynomial(8), decoder='lookup')
+    print("(255, 239) BCH, {} received words per row".format(count))
+    print("errors │ algebraic, us │ lookup, us │ speedup")
+
+    for errors in range(algebraic.t + 1):
+        received = []
+        for _ in range(count):
+            codeword = algebraic.encode(random.getrandbits(algebraic.k))
+            received.append(codeword ^ get_random_number_of_hamming_weight(length=algebraic.n, weight=errors))
+
+        algebraic_time = measure(algebraic.decode_ex, received)
+        lookup_time = measure(lookup.decode_ex, received)
+        print("{:>6} │ {:>13.1f} │ {:>10.1f} │ {:>6.1f}x".format(errors, algebraic_time, lookup_time, algebraic_time / lookup_time))
+
+def bitwise_msb(number):
+    position = 0
+    number = number >> 1
+    while number != 0:
+        position += 1
+        number = number >> 1
+    return position
+
+def bitwise_multiply_polynomials(polynomial1, polynomial2):
+    result = 0
+    for i in range(bitwise_msb(polynomial2) + 1):
+        if polynomial2 & (1 << i):
+            result ^= polynomial1 << i
+    return result
+
+def bitwise_divide_polynomials(polynomial1, polynomial2):
+    quotient = 0
+    reminder = polynomial1
+    while bitwise_msb(reminder) >= bitwise_msb(polynomial2):
+        shift = bitwise_msb(reminder) - bitwise_msb(polynomial2)
+        reminder ^= polynomial2 << shift
+        quotient ^= 1 << shift
+    return quotient, reminder
+
+def bitwise_get_positions_of_binary_ones(number):
+    return [i for i in range(bitwise_msb(number) + 1) if number & (1 << i)]
+
+def benchmark_polynomials(count):
+    """
+    Compares the GF(2)[x] arithmetic of finitefield
+    with the bit at a time loops it replaced on
+    random 1023-bit polynomials.
+    """
+    polynomials = [random.getrandbits(1023) | 1 << 1022 for _ in range(count)]
+    generator = BCH(1023, 9, 1, get_primitive_polynomial(10)).generator_polynomial
+    minimal = get_primitive_polynomial(10)
+    print("1023-bit polynomials, {} per row".format(count))
+    print("operation              │ bitwise, us │ finitefield, us │ speedup")
+
+    rows = [
+        ("msb", bitwise_msb, msb),
+        ("positions of ones", bitwise_get_positions_of_binary_ones, get_positions_of_binary_ones),
+        ("multiply by 1023 bits", lambda p: bitwise_multiply_polynomials(p, polynomials[0]), lambda p: multiply_polynomials(p, polynomials[0])),
+        ("divide by g, deg 40", lambda p: bitwise_divide_polynomials(p, generator), lambda p: divide_polynomials(p, generator)),
+        ("divide by m₁, deg 10", lambda p: bitwise_divide_polynomials(p, minimal), lambda p: divide_polynomials(p, minimal)),
+    ]
+    for name, bitwise, word_parallel in rows:
+        # the bit at a time division is slow, a few samples are enough
+        samples = polynomials[:max(count // 100, 1)] if name.startswith("divide") else polynomials
+        bitwise_time = measure(bitwise, samples)
+        word_parallel_time = measure(word_parallel, samples)
+        print("{:<22} │ {:>11.1f} │ {:>15.1f} │ {:>6.1f}x".format(name, bitwise_time, word_parallel_time, bitwise_time / word_parallel_time))
+
+def benchmark_bitsliced_decoder(count):
+    """
+    Compares the scalar decoder, BCH.decode_batch and
+    the bit-sliced decoder with both backends on the
+    (255, 239) and (1023, 983) codes, the received
+    words having up to t errors.
+    """
+    import batch
+    from bitslice import BitslicedDecoder, BITSLICE_BACKENDS
+
+    print("{} received words per row, time per word".format(count))
+    print("code        │ scalar, us │ batch, us │ bit-sliced numpy, us │ bit-sliced int, us")
+
+    for bch in (BCH(255, 5, 1, get_primitive_polynomial(8)), BCH(1023, 9, 1, get_primitive_polynomial(10))):
+        received = []
+        for index in range(count):
+            codeword = bch.encode(random.getrandbits(bch.k))
+            received.append(codeword ^ get_random_number_of_hamming_weight(length=bch.n, weight=index % (bch.t + 1)))
+        bits = batch.ints_to_bits(received, bch.n)
+        decoder = BitslicedDecoder(bch)
+
+        times = [measure(bch.decode_ex, received), measure(bch.decode_batch, [bits]) / count]
+        for backend in BITSLICE_BACKENDS:
+            times.append(measure(lambda words: decoder.decode_batch(words, backend), [bits]) / count)
+        print("{:<11} │ {:>10.1f} │ {:>9.1f} │ {:>20.1f} │ {:>18.1f}".format("({}, {})".format(bch.n, bch.k), *times))
+
+def benchmark_long_codes(count):
+    """
+    Builds full length codes with t = 8 for m = 13 to
+    16 and measures the peak memory of construction
+    and the decoding throughput with t errors per word,
+    syndromes evaluated with the table of n elements
+    per syndrome and on the remainder by g.
+    """
+    import tracemalloc
+    import numpy # imported by the first field, not part of its build
+
+    t = 8
+    print("t = {}, {} received words per row".format(t, max(count // 10, 1)))
+    print("code            │ build, s │ peak, MiB │ direct, us │ remainder, us │ remainder, Mbit/s")
+
+    for m in range(13, 17):
+        n = 2 ** m - 1
+        tracemalloc.start()
+        start = time.perf_counter()
+        bch = BCH(n, 2 * t + 1, 1, get_primitive_polynomial(m), syndrome_method='direct')
+        build_time = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        tracemalloc.stop()
+        remainder = BCH(n, 2 * t + 1, 1, get_primitive_polynomial(m), syndrome_method='remainder')
+
+        # a long word takes milliseconds, fewer samples are enough
+        received = []
+        for _ in range(max(count // 10, 1)):
+            codeword = bch.encode(random.getrandbits(bch.k))
+            received.append(codeword ^ get_random_number_of_hamming_weight(length=n, weight=t))
+
+        direct_time = measure(bch.decode_ex, received)
+        remainder_time = measure(remainder.decode_ex, received)
+        print("{:<15} │ {:>8.3f} │ {:>9.1f} │ {:>10.1f} │ {:>13.1f} │ {:>17.2f}".format(
+            "({}, {})".format(n, bch.k), build_time, peak, direct_time, remainder_time, n / remainder_time))
+
+def benchmark_encoder(count):
+    """
+    Compares the scalar encoder with BCH.encode_batch
+    on integers and on bit matrices for the (255, 239)
+    and (1023, 983) codes, in codewords per second.
+    """
+    import batch
+
+    print("{} messages per row".format(count))
+    print("code        │ encode, cw/s │ batch ints, cw/s │ batch bits, cw/s")
+
+    for bch in (BCH(255, 5, 1, get_primitive_polynomial(8)), BCH(1023, 9, 1, get_primitive_polynomial(10))):
+        messages = [random.getrandbits(bch.k) for _ in range(count)]
+        bits = batch.ints_to_bits(messages, bch.k)
+        bch.encode_batch(messages[:1]) # the remainder array is built once per code
+
+        times = [measure(bch.encode, messages), measure(bch.encode_batch, [messages]) / count,
+                 measure(bch.encode_batch, [bits]) / count]
+        print("{:<11} │ {:>12.0f} │ {:>16.0f} │ {:>16.0f}".format("({}, {})".format(bch.n, bch.k), *(1e6 / time for time in times)))
+
+BENCHMARKS = {
+    'encode': benchmark_encoder,
+    'roots': benchmark_root_finders,
+    'lookup': benchmark_lookup_decoder,
+    'polynomials': benchmark_polynomials,
+    'bitsliced': benchmark_bitsliced_decoder,
+    'long': benchmark_long_codes,
+}
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks of the BCH encoder and decoder stages')
+    parser.add_argument('benchmark', choices=sorted(BENCHMARKS), help='a benchmark to run')
+    parser.add_argument('--count', type=int, default=1000, help='a number of samples (default: 1000)')
+    parser.add_argument('--seed', type=int, default=1, help='a seed of random samples (default: 1)')
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    BENCHMARKS[args.benchmark](args.count)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+#-*- coding: utf-8 -*-
+
+"""
+Bit-sliced decoding of many received words of one BCH code.
+
+Bit i of many codewords is packed into one plane: a uint64 array, bit
+j of word w coming from codeword 64w + j, or a Python int, bit j
+coming from codeword j. A GF(2ᵐ) value of every codeword is m planes,
+plane a holding the coefficients of αᵃ, so an addition is m XORs for
+all codewords at once.
+
+Syndromes, squares and the multiplications by the constants α⁻ʲ of
+Chien search are GF(2)-linear maps, compiled once per code to straight
+line XOR networks. Berlekamp-Massey is inversion_free_berlekamp_massey_decode
+of bch.py with masks instead of branches; the register length L of
+every codeword is a thermometer code, plane v holding the codewords
+with L ≥ v. A codeword fails when L > t or when the corrected word
+still has nonzero syndromes, and is then returned as received.
+"""
+
+import numpy as np
+
+from bch import *
+import batch
+
+BITSLICE_BACKENDS = ('numpy', 'int')
+XOR_NETWORK_LINE_TERMS = 32 # XORs per generated line, keeps the expressions shallow
+
+def bits_to_planes(bits, backend='numpy'):
+    """
+    Transposes a bit matrix to bit planes.
+
+    :param bits: an (N, n) matrix of bits, column i
+    being the coefficient of xⁱ.
+    :param backend: 'numpy' for planes of ⌈N/64⌉
+    uint64 words, 'int' for N-bit Python ints.
+
+    :returns: a list of n planes.
+    """
+    bits = np.asarray(bits, dtype=np.uint8)
+    count, n = bits.shape
+    if backend == 'int':
+        packed = np.packbits(bits, axis=0, bitorder='little')
+        return [int.from_bytes(packed[:, i].tobytes(), 'little') for i in range(n)]
+
+    padded = np.zeros((-(-count // 64) * 64, n), dtype=np.uint8)
+    padded[:count] = bits
+    packed = np.packbits(padded, axis=0, bitorder='little')
+    return list(np.ascontiguousarray(packed.T).view('<u8'))
+
+def planes_to_bits(planes, count):
+    """
+    Transposes bit planes back to a bit matrix.
+
+    :param planes: a list of n planes from
+    bits_to_planes.
+    :param count: a number of codewords N.
+
+    :returns: an (N, n) uint8 matrix.
+    """
+    if isinstance(planes[0], int):
+        byte_count = -(-count // 8)
+        data = b"".join(plane.to_bytes(byte_count, 'little') for plane in planes)
+        packed = np.frombuffer(data, dtype=np.uint8).reshape(len(planes), byte_count)
+    else:
+        packed = np.ascontiguousarray(np.stack(planes), dtype='<u8').view(np.uint8)
+    return np.ascontiguousarray(np.unpackbits(packed, axis=1, bitorder='little')[:, :count].T)
+
+def compile_xor_network(rows):
+    """
+    Compiles a GF(2)-linear map to a function of
+    straight line XORs.
+
+    :param rows: for every output plane, a list of
+    indices of the input planes it is the XOR of.
+
+    :returns: a function network(planes, zero)
+    returning a tuple of output planes, zero for an
+    empty row.
+    """
+    lines = ["def network(x, z):"]
+    for output, row in enumerate(rows):
+        terms = ["x[{}]".format(index) for index in row] or ["z"]
+        for start in range(0, len(terms), XOR_NETWORK_LINE_TERMS):
+            lines.append("    o{} {}= {}".format(output, "^" if start else "", " ^ ".join(terms[start:start + XOR_NETWORK_LINE_TERMS])))
+    lines.append("    return ({},)".format(", ".join("o{}".format(output) for output in range(len(rows)))))
+    namespace = {}
+    exec("\n".join(lines), namespace)
+    return namespace['network']
+
+def get_linear_map_rows(images, power):
+    """
+    Rows of the XOR network of a linear map of
+    GF(2ᵖᵒʷᵉʳ) values.
+
+    :param images: an image, as a field element, of
+    every input plane.
+    :param power: the power of the field.
+
+    :returns: rows for compile_xor_network.
+    """
+    return [[index for index, image in enumerate(images) if image >> bit & 1] for bit in range(power)]
+
+def get_constant_multiplication_network(field, constant):
+    """
+    XOR network of the multiplication by a nonzero
+    field element, αᵃ being mapped to αᵃ·c.
+    """
+    return compile_xor_network(get_linear_map_rows(
+        [field.mul(field.exp[a], constant) for a in range(field.power)], field.power))
+
+class BitslicedDecoder:
+    """
+    Bounded distance decoder of a BCH code working on
+    bit planes of many received words at once.
+    """
+
+    def __init__(self, bch):
+        field = bch.field
+        self.bch = bch
+        self.field = field
+        self.power = bch.power
+        self.n = bch.n
+        self.k = bch.k
+        self.t = bch.t
+        self.b = bch.b
+
+        syndrome_table = bch.syndrome_table
+        if syndrome_table is None:
+            syndrome_table = get_syndrome_table(field, bch.n, bch.t, bch.b)
+        self.syndrome_networks = [None if row is None else compile_xor_network(get_linear_map_rows(row, field.power))
+                                  for row in syndrome_table]
+        self.square_network = compile_xor_network(get_linear_map_rows(
+            [field.exp[2 * a % field.order] for a in range(field.power)], field.power))
+        self.chien_networks = [get_constant_multiplication_network(field, field.exp[(-j) % field.order])
+                               for j in range(1, bch.t + 1)]
+        # xᵐ = p(x) - xᵐ folds a product of degree 2m - 2
+        self.reduction = get_positions_of_binary_ones(field.primitive_polynomial ^ (1 << field.power))
+
+    def multiply(self, a, b, zero):
+        """
+        Multiplies two bit-sliced field values.
+        """
+        power = self.power
+        product = [zero] * (2 * power - 1)
+        for i in range(power):
+            if a[i] is zero:
+                continue
+            for j in range(power):
+                product[i + j] = product[i + j] ^ (a[i] & b[j])
+        for degree in range(2 * power - 2, power - 1, -1):
+            for position in self.reduction:
+                product[degree - power + position] = product[degree - power + position] ^ product[degree]
+        return product[:power]
+
+    def get_syndromes(self, planes, zero):
+        """
+        Bit-sliced syndromes S_b .. S_b+2t-1.
+
+        :returns: a list of 2t field values.
+        """
+        syndromes = []
+        for index, network in enumerate(self.syndrome_networks):
+            if network is None:
+                j = self.b + index
+                syndromes.append(self.square_network(syndromes[j // 2 - self.b], zero))
+            else:
+                syndromes.append(network(planes, zero))
+        return syndromes
+
+    def has_syndromes(self, planes, zero):
+        """
+        Marks the words with a nonzero syndrome, the
+        squared ones follow from the others.
+        """
+        nonzero = zero
+        for network in self.syndrome_networks:
+            if network is not None:
+                for plane in network(planes, zero):
+                    nonzero = nonzero | plane
+        return nonzero
+
+    def berlekamp_massey(self, syndromes, full, zero):
+        """
+        Bit-sliced inversion-free Berlekamp-Massey.
+
+        :returns: the t + 1 coefficients of Λ(x) and the
+        plane of words with L > t.
+        """
+        t = self.t
+        power = self.power
+        multiply = self.multiply
+        nothing = [zero] * power
+        one = [full] + [zero] * (power - 1)
+        step = 2 if self.b == 1 else 1
+
+        Lambda = [one] + [nothing] * t
+        B = [nothing, one] + [nothing] * (t - 1) # xB(x) of the algorithm
+        gamma = one
+        # lengths[v] has the words with L ≥ v
+        lengths = [full] + [zero] * (2 * t + 1)
+
+        for r in range(0, 2 * t, step):
+            delta = nothing
+            for i in range(min(r, t) + 1):
+                delta = [d ^ p for d, p in zip(delta, multiply(Lambda[i], syndromes[r - i], zero))]
+
+            nonzero = zero
+            for plane in delta:
+                nonzero = nonzero | plane
+            # δ ≠ 0 and 2L ≤ r
+            change = nonzero & (lengths[r // 2 + 1] ^ full)
+            keep = change ^ full
+
+            updated = [[g ^ d for g, d in zip(multiply(gamma, Lambda[i], zero), multiply(delta, B[i], zero))]
+                       for i in range(t + 1)]
+
+            # B = xΛ or xB, γ = δ and L = r + 1 - L where the length changes
+            B = [[(l & change) | (s & keep) for l, s in zip(shifted, b)]
+                 for shifted, b in zip([nothing] + Lambda[:t], [nothing] + B[:t])]
+            gamma = [(d & change) | (g & keep) for d, g in zip(delta, gamma)]
+            lengths = [(self._complement(lengths, r + 2 - v, full, zero) & change) | (lengths[v] & keep)
+                       for v in range(len(lengths))]
+            Lambda = updated
+
+            if step == 2:
+                # the next discrepancy is zero: B = xB
+                B = [nothing] + B[:t]
+
+        return Lambda, lengths[t + 1]
+
+    @staticmethod
+    def _complement(lengths, v, full, zero):
+        """
+        Words with L < v.
+        """
+        if v <= 0:
+            return zero
+        if v >= len(lengths):
+            return full
+        return lengths[v] ^ full
+
+    def chien_search(self, Lambda, full, zero):
+        """
+        Bit-sliced Chien search over the n positions.
+
+        :returns: a list of n error planes.
+        """
+        constant = Lambda[0]
+        registers = Lambda[1:]
+        networks = self.chien_networks
+        errors = []
+        for position in range(self.n):
+            value = constant
+            for register in registers:
+                value = [v ^ r for v, r in zip(value, register)]
+            nonzero = zero
+            for plane in value:
+                nonzero = nonzero | plane
+            errors.append(nonzero ^ full)
+            if position + 1 < self.n:
+                registers = [network(register, zero) for network, register in zip(networks, registers)]
+        return errors
+
+    def decode_planes(self, planes, count):
+        """
+        Decodes the words of bit planes.
+
+        :param planes: a list of n planes from
+        bits_to_planes.
+        :param count: a number of codewords N.
+
+        :returns: the corrected planes, the plane of
+        words with errors and the plane of decoding
+        failures.
+        """
+        if isinstance(planes[0], int):
+            full = (1 << count) - 1
+            zero = 0
+        else:
+            full = np.full(planes[0].shape, ~np.uint64(0))
+            zero = np.zeros(planes[0].shape, dtype=np.uint64)
+
+        syndromes = self.get_syndromes(planes, zero)
+        Lambda, too_long = self.berlekamp_massey(syndromes, full, zero)
+        errors = self.chien_search(Lambda, full, zero)
+
+        corrected = [plane ^ error for plane, error in zip(planes, errors)]
+        failure = too_long | self.has_syndromes(corrected, zero)
+        success = failure ^ full
+        erroneous = failure
+        for error in errors:
+            erroneous = erroneous | error
+        return [plane ^ (error & success) for plane, error in zip(planes, errors)], erroneous, failure
+
+    def decode_batch(self, received, backend='numpy'):
+        """
+        Decodes a batch of received words like
+        BCH.decode_batch.
+
+        :param received: an (N, n) matrix of bits.
+        :param backend: one of BITSLICE_BACKENDS.
+
+        :returns: corrected codewords and messages as bit
+        matrices and an array of batch.DECODE_* statuses.
+        """
+        received = np.asarray(received, dtype=np.uint8)
+        if received.ndim != 2 or received.shape[1] != self.n:
+            raise ValueError("Expected an (N, {}) matrix of received bits, got {}".format(self.n, received.shape))
+        count = received.shape[0]
+        if count == 0:
+            return received.copy(), received[:, self.n - self.k:], np.zeros(0, dtype=np.int8)
+
+        corrected, erroneous, failure = self.decode_planes(bits_to_planes(received, backend), count)
+        bits = planes_to_bits(corrected, count)
+        marks = planes_to_bits([erroneous, failure], count)
+
+        status = np.full(count, batch.DECODE_NO_ERRORS, dtype=np.int8)
+        status[marks[:, 0] == 1] = batch.DECODE_CORRECTED
+        status[marks[:, 1] == 1] = batch.DECODE_FAILURE
+        return bits, bits[:, self.n - self.k:], status
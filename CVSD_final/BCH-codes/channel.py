@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+#-*- coding: utf-8 -*-
+
+"""
+BPSK over an additive white Gaussian noise channel with NumPy.
+
+Every function works on a whole (N, n) batch at once: bits are a
+uint8 matrix, column i being the coefficient of xⁱ as in batch.py,
+bit 0 is sent as +1 and bit 1 as -1, so a negative LLR means 1.
+"""
+
+import math
+
+import numpy as np
+
+LLR_SCALE = 8 # quantization steps per unit of LLR
+
+def get_sigma(signal_to_noise_ratio, code_speed):
+    """
+    Noise deviation of BPSK with unit energy per
+    symbol.
+
+    :param signal_to_noise_ratio: Eb/N0 in dB.
+    :param code_speed: a rate k/n of the code.
+
+    :returns: the deviation σ.
+    """
+    return math.sqrt(1.0 / (2 * code_speed * math.pow(10, signal_to_noise_ratio / 10.0)))
+
+def get_crossover_probability(sigma):
+    """
+    Probability Q(1/σ) that a hard decision of a
+    BPSK symbol is wrong, i.e. the crossover
+    probability of the equivalent binary symmetric
+    channel.
+
+    :param sigma: the noise deviation.
+
+    :returns: the probability.
+    """
+    return 0.5 * math.erfc(1.0 / (sigma * math.sqrt(2.0)))
+
+def modulate(bits):
+    """
+    :param bits: an (N, n) matrix of bits.
+
+    :returns: an (N, n) float64 matrix of ±1 symbols.
+    """
+    return 1.0 - 2.0 * np.asarray(bits, dtype=np.float64)
+
+def add_noise(symbols, sigma, rng):
+    """
+    :param symbols: a matrix of symbols.
+    :param sigma: the noise deviation.
+    :param rng: a np.random.Generator.
+
+    :returns: the symbols with Gaussian noise.
+    """
+    return symbols + rng.standard_normal(symbols.shape) * sigma
+
+def transmit(bits, sigma, rng):
+    """
+    Sends bits over the channel.
+
+    :returns: an (N, n) matrix of received symbols.
+    """
+    return add_noise(modulate(bits), sigma, rng)
+
+def get_llrs(received, sigma):
+    """
+    :param received: a matrix of received symbols.
+    :param sigma: the noise deviation.
+
+    :returns: the LLRs 2y/σ².
+    """
+    return received * (2.0 / sigma ** 2)
+
+def quantize_llrs(llrs, scale=LLR_SCALE):
+    """
+    Quantizes LLRs to 8-bit signed integers.
+
+    :param llrs: a matrix of LLRs.
+    :param scale: quantization steps per unit of LLR.
+
+    :returns: an int8 matrix, saturated to -128..127.
+    """
+    return np.clip(np.rint(llrs * scale), -128, 127).astype(np.int8)
+
+def hard_decisions(values):
+    """
+    Slices received symbols or LLRs to bits,
+    a zero is sliced to 0.
+
+    :param values: a matrix of symbols or LLRs.
+
+    :returns: a uint8 matrix of bits.
+    """
+    return (np.asarray(values) < 0).astype(np.uint8)
@@ -1,10 +1,23 @@
 #!/usr/bin/env python3 
 #-*- coding: utf-8 -*-
 
-from itertools import combinations
+from array import array
 import sys
 import random
 
+# positions of set bits of every byte, lowest first
+BYTE_POSITIONS = [tuple(i for i in range(8) if byte >> i & 1) for byte in range(256)]
+SPARSE_POSITIONS_MAX_WEIGHT = 48 # more set bits are found a byte at a time
+
+# reduction tables of divide_polynomials by divisor,
+# cleared when DIVISION_TABLE_CACHE_SIZE is exceeded
+DIVISION_TABLE_CACHE_SIZE = 64
+division_tables = {}
+
+# fields of at least this power build their tables with
+# NumPy when it is installed
+VECTORIZED_FIELD_POWER = 12
+
 def get_primitive_polynomial(power):
     """
     Retrieves a table of primitive
@@ -165,21 +178,305 @@ def get_logarithm_table(power, primitive_polynomial):
         logarithm_table[i] = trim_polynomial(polynomial=multiplied_by_x_polynomial, length=power)
     return logarithm_table
 
+def get_field_tables_vectorized(power, primitive_polynomial, typecode):
+    """
+    Builds the exponent and logarithm tables of
+    GaloisField with NumPy. The known powers
+    α⁰ .. αᴸ⁻¹ are multiplied by αᴸ at once, which
+    doubles them, a multiplication by a constant
+    being a XOR of its products with the bits of
+    the basis α⁰ .. αᵖᵒʷᵉʳ⁻¹.
+
+    :returns: the tables as arrays of the typecode,
+    or None, None without NumPy.
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None, None
+
+    order = (1 << power) - 1
+    dtype = numpy.dtype('<u{}'.format(array(typecode).itemsize))
+    elements = numpy.zeros(order, dtype=dtype)
+    elements[0] = 1
+    length = 1
+    while length < order:
+        multiplier = int(elements[length - 1]) << 1 # αᴸ
+        if multiplier >> power:
+            multiplier ^= primitive_polynomial
+        count = min(length, order - length)
+        known = elements[:count]
+        product = numpy.zeros(count, dtype=dtype)
+        basis = multiplier # αᵃ⁺ᴸ
+        for bit in range(power):
+            product ^= ((known >> bit) & 1) * dtype.type(basis)
+            basis <<= 1
+            if basis >> power:
+                basis ^= primitive_polynomial
+        elements[length:length + count] = product
+        length += count
+
+    logarithms = numpy.zeros(order + 1, dtype=dtype)
+    logarithms[elements] = numpy.arange(order, dtype=dtype)
+    exp = array(typecode)
+    exp.frombytes(numpy.concatenate((elements, elements)).tobytes())
+    log = array(typecode)
+    log.frombytes(logarithms.tobytes())
+    return exp, log
+
+class GaloisField:
+    """
+    Finite field GF(2ᵖᵒʷᵉʳ) with dense exponent
+    and logarithm tables.
+
+    Elements are integers in the polynomial basis.
+    The exponent table is stored twice in a row, so
+    a sum of two logarithms can be used as an index
+    without reducing it modulo 2ᵖᵒʷᵉʳ - 1.
+    """
+
+    def __init__(self, power, primitive_polynomial):
+        """
+        Builds the tables of the field.
+
+        :param power: the power in size of the
+        field GF(2ᵖᵒʷᵉʳ).
+        :param primitive_polynomial: a primitive
+        polynomial of the field.
+
+        :raises: ValueError if the primitive polynomial
+        is not of the specified power.
+        """
+        if msb(primitive_polynomial) != power:
+            raise ValueError("The primitive polynomial {:b} is not of the specified power n = {}".format(primitive_polynomial, power))
+
+        order = (1 << power) - 1 # number of nonzero elements
+        typecode = 'H' if power <= 16 else 'I'
+
+        exp = None
+        if power >= VECTORIZED_FIELD_POWER:
+            exp, log = get_field_tables_vectorized(power, primitive_polynomial, typecode)
+
+        if exp is None:
+            exp = array(typecode, [0]) * (2 * order)
+            log = array(typecode, [0]) * (order + 1)
+
+            element = 1
+            for i in range(order):
+                exp[i] = element
+                exp[i + order] = element
+                log[element] = i
+                element <<= 1
+                if element >> power:
+                    element ^= primitive_polynomial
+
+        self.power = power
+        self.order = order
+        self.primitive_polynomial = primitive_polynomial
+        self.exp = exp
+        self.log = log
+        self._exp_array = None
+        self._log_array = None
+
+    def mul(self, a, b):
+        """
+        Multiplies two elements of the field.
+        """
+        if a == 0 or b == 0:
+            return 0
+        return self.exp[self.log[a] + self.log[b]]
+
+    def div(self, a, b):
+        """
+        Divides an element of the field by another one.
+
+        :raises: ZeroDivisionError if the divisor is zero.
+        """
+        if b == 0:
+            raise ZeroDivisionError("Division by zero in GF(2^{})".format(self.power))
+        if a == 0:
+            return 0
+        return self.exp[self.log[a] - self.log[b] + self.order]
+
+    def inv(self, a):
+        """
+        Returns the multiplicative inverse of an element.
+
+        :raises: ZeroDivisionError if the element is zero.
+        """
+        if a == 0:
+            raise ZeroDivisionError("Zero has no inverse in GF(2^{})".format(self.power))
+        return self.exp[self.order - self.log[a]]
+
+    def pow(self, a, exponent):
+        """
+        Raises an element to an integer (possibly
+        negative) power.
+        """
+        if a == 0:
+            if exponent < 0:
+                raise ZeroDivisionError("Zero has no inverse in GF(2^{})".format(self.power))
+            return 1 if exponent == 0 else 0
+        return self.exp[(self.log[a] * exponent) % self.order]
+
+    def sqrt(self, a):
+        """
+        Returns the square root of an element,
+        which is unique in GF(2ᵖᵒʷᵉʳ).
+        """
+        if a == 0:
+            return 0
+        return self.exp[(self.log[a] * ((self.order + 1) // 2)) % self.order]
+
+    def element(self, logarithm):
+        """
+        Maps a power of the primitive element to the
+        element itself. The power -1 stands for zero,
+        as in the logarithm table.
+        """
+        if logarithm < 0:
+            return 0
+        return self.exp[logarithm % self.order]
+
+    def logarithm(self, a):
+        """
+        Maps an element to the power of the primitive
+        element, -1 for zero.
+        """
+        if a == 0:
+            return -1
+        return self.log[a]
+
+    def powers(self, exponent, count):
+        """
+        Lists the powers αᵉⁱ of the element αᵉ,
+        i = 0 .. count - 1.
+
+        :returns: an array of count elements.
+        """
+        exponent %= self.order
+        if self.power >= VECTORIZED_FIELD_POWER:
+            try:
+                import numpy
+            except ImportError:
+                numpy = None
+            if numpy is not None:
+                exponents = numpy.arange(count, dtype=numpy.int64) * exponent % self.order
+                row = array(self.exp.typecode)
+                row.frombytes(numpy.asarray(self.exp)[exponents].tobytes())
+                return row
+
+        row = array(self.exp.typecode, [0]) * count
+        current = 0
+        for i in range(count):
+            row[i] = self.exp[current]
+            current += exponent
+            if current >= self.order:
+                current -= self.order
+        return row
+
+    @property
+    def exp_array(self):
+        """
+        The exponent table as a NumPy array.
+        """
+        if self._exp_array is None:
+            import numpy
+            self._exp_array = numpy.asarray(self.exp).astype(numpy.int64)
+        return self._exp_array
+
+    @property
+    def log_array(self):
+        """
+        The logarithm table as a NumPy array.
+        """
+        if self._log_array is None:
+            import numpy
+            self._log_array = numpy.asarray(self.log).astype(numpy.int64)
+        return self._log_array
+
+    def __getstate__(self):
+        # the NumPy copies are rebuilt on demand, a pickled
+        # field loads without NumPy
+        state = self.__dict__.copy()
+        state['_exp_array'] = None
+        state['_log_array'] = None
+        return state
+
+def get_multiples_table(polynomial, width):
+    """
+    Builds a carry-less multiplication table
+    of a polynomial by every polynomial of
+    degree less than width.
+
+    :param polynomial: a polynomial.
+    :param width: a number of bits of the
+    multipliers, 4 for nibbles, 8 for bytes.
+
+    :returns: a list of 2ʷⁱᵈᵗʰ products.
+    """
+    table = [0] * (1 << width)
+    for multiplier in range(1, 1 << width):
+        table[multiplier] = (table[multiplier >> 1] << 1) ^ (polynomial if multiplier & 1 else 0)
+    return table
+
 def multiply_polynomials(polynomial1, polynomial2):
     """
     Multiplies two polynomials in GF(2ᵖᵒʷᵉʳ).
+    Short multipliers are added shifted per
+    set bit, long ones a nibble or a byte at a
+    time with a table of multiples.
 
     :param polynomial1: 1st polynomial.
     :param polynomial2: 2nd polynomial.
     
     :returns: the product of two polynomials.
     """
+    if polynomial1.bit_length() < polynomial2.bit_length():
+        polynomial1, polynomial2 = polynomial2, polynomial1
+
+    length = polynomial2.bit_length()
     result = 0
-    for i in range(msb(polynomial2) + 1):
-        if is_bit_set(polynomial2, i):
-            result ^= polynomial1 << i
+    if length <= 64:
+        while polynomial2:
+            lowest = polynomial2 & -polynomial2
+            result ^= polynomial1 << lowest.bit_length() - 1
+            polynomial2 ^= lowest
+        return result
+
+    width = 4 if length <= 256 else 8
+    multiples = get_multiples_table(polynomial1, width)
+    mask = (1 << width) - 1
+    for shift in range(0, length, width):
+        result ^= multiples[(polynomial2 >> shift) & mask] << shift
     return result
 
+def get_division_table(polynomial):
+    """
+    Builds a table to divide by a polynomial
+    a byte of quotient at a time: for every
+    value of the 8 leading bits of a dividend
+    above the degree of the divisor it holds
+    the quotient byte and its product with
+    the divisor, which clears these bits.
+
+    :param polynomial: a divisor.
+
+    :returns: a list of 256 (quotient,
+    multiple) pairs.
+    """
+    degree = polynomial.bit_length() - 1
+    table = []
+    for leading in range(256):
+        quotient = 0
+        reminder = leading << degree
+        for shift in range(7, -1, -1):
+            if reminder >> degree + shift & 1:
+                reminder ^= polynomial << shift
+                quotient |= 1 << shift
+        table.append((quotient, (leading << degree) ^ reminder))
+    return table
+
 def divide_polynomials(polynomial1, polynomial2):
     """
         101010100000000 | 111010001
@@ -188,17 +485,36 @@ def divide_polynomials(polynomial1, polynomial2):
               __________|
                11100101 <- reminder
 
+    Long quotients are computed a byte at a
+    time with a table from get_division_table.
+
     :param polynomial1: 1st polynomial.
     :param polynomial2: 2nd polynomial.
 
     :returns: the quotient and the remainder.
     """
+    degree = polynomial2.bit_length() - 1
     quotient = 0
     reminder = polynomial1
-    while msb(reminder) >= msb(polynomial2):
-        shift = msb(reminder) - msb(polynomial2)
+
+    if reminder.bit_length() - degree > 32:
+        table = division_tables.get(polynomial2)
+        if table is None:
+            if len(division_tables) >= DIVISION_TABLE_CACHE_SIZE:
+                division_tables.clear()
+            table = division_tables[polynomial2] = get_division_table(polynomial2)
+        shift = reminder.bit_length() - degree - 8
+        while shift >= 0:
+            quotient_byte, multiple = table[(reminder >> shift + degree) & 0xFF]
+            reminder ^= multiple << shift
+            quotient |= quotient_byte << shift
+            shift = reminder.bit_length() - degree - 8
+
+    shift = reminder.bit_length() - 1 - degree
+    while shift >= 0:
         reminder ^= polynomial2 << shift
-        quotient ^= 1 << shift
+        quotient |= 1 << shift
+        shift = reminder.bit_length() - 1 - degree
     return quotient, reminder
 
 def trim_polynomial(polynomial, length):
@@ -229,15 +545,68 @@ def polynomial_of_argument_to_power(polynomial, power):
     specified power.
     """
     
-    length = msb(polynomial) + 1
     result = 0
 
-    for i in range(length):
-        if is_bit_set(polynomial, i):
-            result |= 1 << i * power
+    for i in get_positions_of_binary_ones(polynomial):
+        result |= 1 << i * power
     
     return result
 
+def get_cyclotomic_coset(exponent, power):
+    """
+    Builds the cyclotomic coset of an exponent,
+    {e, 2e, 4e, ...} modulo 2ᵖᵒʷᵉʳ - 1.
+
+    :param exponent: a power of the primitive element.
+    :param power: the power in size of the
+    field GF(2ᵖᵒʷᵉʳ).
+
+    :returns: a list of exponents, the given one
+    first.
+    """
+    order = (1 << power) - 1
+    coset = [exponent % order]
+    member = (2 * coset[0]) % order
+    while member != coset[0]:
+        coset.append(member)
+        member = (2 * member) % order
+    return coset
+
+def get_cyclotomic_coset_exponents(power):
+    """
+    Lists all cyclotomic cosets of the field in
+    order of their smallest exponents, each member
+    being visited once.
+
+    :param power: the power in size of the
+    field GF(2ᵖᵒʷᵉʳ).
+
+    :returns: a list of lists of exponents, e.g.
+    [[0], [1, 2, 4, 8], [3, 6, 12, 9], [5, 10],
+    [7, 14, 13, 11]] for GF(2⁴).
+    """
+    order = (1 << power) - 1
+    visited = bytearray(order)
+    cyclotomic_cosets = []
+    for leader in range(order):
+        if visited[leader]:
+            continue
+        coset = get_cyclotomic_coset(leader, power)
+        for member in coset:
+            visited[member] = 1
+        cyclotomic_cosets.append(coset)
+    return cyclotomic_cosets
+
+def exponents_to_bitmask(exponents):
+    """
+    Converts exponents to the binary vector form,
+    bit e set for the exponent e.
+    """
+    bitmask = 0
+    for exponent in exponents:
+        bitmask |= 1 << exponent
+    return bitmask
+
 def get_cyclotomic_cosets(power):
     """
     Fills a list of cyclotomic cosets.
@@ -252,33 +621,17 @@ def get_cyclotomic_cosets(power):
     :param power: the power in size of the
     field GF(2ᵖᵒʷᵉʳ).
 
-    :returns: a list of cyclotomic cosets.
+    :returns: a list of cyclotomic cosets as binary
+    vectors, bit e set for the exponent e, {a0}
+    last, see get_cyclotomic_coset_exponents for
+    lists of exponents.
     """
-    cyclotomic_cosets = []
-    all_cyclotomic_members = 1
-    i = 0
-
-    while all_cyclotomic_members < 2 ** (2 ** power - 1) - 1:
-        cyclotomic_cosets.append(0)
-        k = 0
-        while True:
-            if not is_bit_set(all_cyclotomic_members, k):
-                break
-            k += 1
-        while True:
-            k = k % (2 ** power - 1)
-            if is_bit_set(cyclotomic_cosets[i], k):
-                break
-            cyclotomic_cosets[i] ^= 1 << k
-            k *= 2
-        all_cyclotomic_members ^= cyclotomic_cosets[i]
-        i += 1
-
+    cyclotomic_cosets = [exponents_to_bitmask(coset) for coset in get_cyclotomic_coset_exponents(power)[1:]]
     cyclotomic_cosets.append(1) # {a0}
     
     return cyclotomic_cosets
 
-def check_polynomial_with_root(polynomial, root, logarithm_table):
+def check_polynomial_with_root(polynomial, root, field):
     """
     Substitutes roots in polynomial.
 
@@ -287,23 +640,20 @@ def check_polynomial_with_root(polynomial, root, logarithm_table):
     :param root: a binary root,
     where positions of 1s mean
     the power of the field.
-    :param logarithm_table:
-    a table which maps logarithms
-    to polynomials - members of
-    the field.
+    :param field: the Galois field
+    the root belongs to.
     
     :returns: a binary vector.
     """
-    number_of_field_elements = len(logarithm_table) - 1
     power_array = get_positions_of_binary_ones(polynomial)
 
     result = 0
     for i in power_array:
-        result ^= logarithm_table[(i * root) % number_of_field_elements]
+        result ^= field.exp[(i * root) % field.order]
     
     return result
 
-def get_polynomial_from_roots(roots, logarithm_table):
+def get_polynomial_from_roots(roots, field):
     """
     Performs multiplication of a
     polynomial represented by its
@@ -313,28 +663,30 @@ def get_polynomial_from_roots(roots, logarithm_table):
     :param roots: a binary vector
     of roots, where positions of
     1s mean the power a primitive
-    element a of the field.
-    :param logarithm_table:
-    a table which maps logarithms
-    to polynomials - members of
-    the field.
+    element a of the field, or a
+    list of the powers.
+    :param field: the Galois field
+    the roots belong to.
     
     :returns: a binary vector
     represents a polynomial in
     form of xˡ¹ + xˡ² ... + xˡⁿ + 1
     """
-    if roots == 0:
+    if not roots:
         return 0
 
-    number_of_field_elements = len(logarithm_table) - 1
-    root_array = get_positions_of_binary_ones(number=roots)
+    # coefficients[i] is the elementary symmetric
+    # function of degree i of the roots, it is
+    # built by multiplying out one root at a time
+    root_array = get_positions_of_binary_ones(number=roots) if isinstance(roots, int) else roots
+    coefficients = [1] + [0] * len(root_array)
+    for count, root in enumerate(root_array, 1):
+        for i in range(count, 0, -1):
+            coefficients[i] ^= field.mul(coefficients[i - 1], field.exp[root % field.order])
+
     polynomial = 1 << len(root_array)
-    for i in range(len(root_array)):
-        coefficient = 0
-        for combination in combinations(root_array, i + 1):
-            coefficient ^= logarithm_table[sum(combination) % number_of_field_elements]
-        addition = coefficient << len(root_array) - i - 1
-        polynomial ^= addition
+    for i in range(1, len(root_array) + 1):
+        polynomial ^= coefficients[i] << len(root_array) - i
 
     return polynomial
 
@@ -348,15 +700,39 @@ def get_positions_of_binary_ones(number):
 
     :returns: positions of 1s.
     """
-    length = msb(number) + 1
     result = []
 
-    for i in range(0, length):
-        if is_bit_set(number, i):
-            result.append(i)
+    # sparse numbers are walked by their lowest set
+    # bit, each step costing O(bit length), dense ones
+    # a byte at a time with a table
+    weight = get_hamming_weight(number)
+    if weight <= SPARSE_POSITIONS_MAX_WEIGHT and weight * 8 <= number.bit_length():
+        while number:
+            lowest = number & -number
+            result.append(lowest.bit_length() - 1)
+            number ^= lowest
+        return result
+
+    length = (number.bit_length() + 7) // 8
+    for offset, byte in enumerate(number.to_bytes(length, 'little')):
+        for i in BYTE_POSITIONS[byte]:
+            result.append(8 * offset + i)
 
     return result
 
+def get_hamming_weight(number):
+    """
+    Counts 1s in a binary vector.
+
+    :param number: a vector to
+    analyze.
+
+    :returns: a number of 1s.
+    """
+    if sys.version_info >= (3, 10):
+        return number.bit_count()
+    return bin(number).count("1")
+
 def is_bit_set(polynomial, n):
     """
     Checks if bit is setted.
@@ -368,7 +744,7 @@ def is_bit_set(polynomial, n):
 
     :returns: a status of bit.
     """
-    return (polynomial & (1 << n))
+    return (polynomial >> n) & 1
 
 def binary_to_string(polynomial, direction_polynomial=True):
     """
@@ -451,14 +827,7 @@ def msb(number):
     number to check.
 
     :returns: a position of 
-    most significant bit.
+    most significant bit, 0 for
+    zero.
     """
-
-    position = 0
-    number = number >> 1
-    
-    while number != 0:
-        position += 1
-        number = number >> 1
-    
-    return position
+    return max(number.bit_length() - 1, 0)
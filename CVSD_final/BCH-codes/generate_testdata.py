@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+#-*- coding: utf-8 -*-
+
+"""
+Generates stimulus and golden answer files for the RTL testbench in
+the layout of testdata/pXXX.txt and pXXXa.txt.
+
+Random messages are encoded, sent over the AWGN channel of channel.py
+and quantized to 8-bit LLRs. A codeword is
+ceil((n+1)/8) rows of 64 bits: LLR0 (don't care, 0), then LLR1 to LLRn
+of X^(n-1) to X^0, the first LLR in the most significant bits. Its
+answer is t lines of 10-bit error positions in ascending order, padded
+with PADDING_POSITION, found by the hard decoder for the codes 100-300
+and by the Chase-II decoder for the soft-decision codes 400-600.
+Codewords which can't be decoded, or whose answer needs more than t
+positions, are replaced by new ones.
+
+Chunks of codewords are generated on a process pool, each from its own
+seed derived from the seed of the run and the index of the chunk, and
+written in order as they are done, so the output doesn't depend on the
+number of workers and needs memory for a few chunks only.
+
+Usage: python3 generate_testdata.py <code> [--count N] [--snr DB]
+       [--seed S] [--workers W] [--output-dir DIR]
+
+test.v reads at most 8192 rows and 512 answers, larger corpora need
+its testdata/testa arrays and NTEST raised.
+"""
+
+import os
+import math
+import argparse
+import multiprocessing
+
+import numpy as np
+
+from bch import *
+import channel
+from analyze_llr_inputs import BCH_CONFIGS, llr_values_to_codeword
+
+CHUNK_SIZE = 1000
+PADDING_POSITION = 1023 # answer line of a missing error position
+POSITION_BITS = 10 # width of odata
+
+code = None # BCH of a worker, see init_worker
+
+def format_stimulus(llrs):
+    """
+    Formats LLR rows of codewords as the 64-bit
+    binary rows of pXXX.txt.
+
+    :param llrs: an (N, 8R) int8 matrix, LLR0 first.
+
+    :returns: the text as bytes.
+    """
+    bits = np.unpackbits(llrs.view(np.uint8), axis=1).reshape(-1, 64)
+    text = np.empty((bits.shape[0], 65), dtype=np.uint8)
+    text[:, :64] = bits + ord('0')
+    text[:, 64] = ord('\n')
+    return text.tobytes()
+
+def format_answers(answers, t, padding=PADDING_POSITION):
+    """
+    Formats error positions as the lines of
+    pXXXa.txt, t lines per codeword.
+
+    :param answers: lists of error positions.
+    :param t: a number of errors to correct.
+    :param padding: a position for missing errors.
+
+    :returns: the text as bytes.
+    """
+    lines = []
+    for positions in answers:
+        for position in sorted(positions) + [padding] * (t - len(positions)):
+            lines.append("{:0{}b}\n".format(position, POSITION_BITS))
+    return "".join(lines).encode()
+
+def init_worker(code_id, flips):
+    global code
+    config = BCH_CONFIGS[code_id]
+    code = (config, flips, BCH(config['n'], 2 * config['t'] + 1, 1, get_primitive_polynomial(config['m']),
+                               root_finder='closed_form'))
+
+def generate_chunk(arguments):
+    """
+    Generates a chunk of decodable codewords.
+
+    :param arguments: the seed of the run, the index
+    of the chunk, the number of codewords and Eb/N0.
+
+    :returns: the stimulus and the answers as bytes,
+    and the number of replaced codewords.
+    """
+    seed, chunk, count, signal_to_noise_ratio = arguments
+    config, flips, bch = code
+    n, t = bch.n, bch.t
+    rows = math.ceil((n + 1) / 8)
+    rng = np.random.default_rng(np.random.SeedSequence([seed, chunk]))
+    sigma = channel.get_sigma(signal_to_noise_ratio, bch.k / (bch.n * 1.))
+
+    stimulus = []
+    answers = []
+    replaced = 0
+    while len(answers) < count:
+        messages = rng.integers(0, 2, size=(count - len(answers), bch.k), dtype=np.uint8)
+        codewords = bch.encode_batch(messages)
+        received = channel.transmit(codewords, sigma, rng)
+        quantized = channel.quantize_llrs(channel.get_llrs(received, sigma))
+
+        # column i of the codeword is X^i, LLRi is X^(n-i)
+        llrs = np.zeros((quantized.shape[0], rows * 8), dtype=np.int8)
+        llrs[:, 1:n + 1] = quantized[:, ::-1]
+        hard_decisions = channel.hard_decisions(quantized)
+
+        if config.get('soft', False):
+            positions = []
+            for row in llrs:
+                try:
+                    _, codeword = bch.decode_soft([int(row[n - i]) for i in range(n)], flips=flips)
+                except DecodingFailure:
+                    positions.append(None)
+                    continue
+                hard_decision = llr_values_to_codeword(row, n)
+                positions.append(get_positions_of_binary_ones(codeword ^ hard_decision))
+        else:
+            import batch
+            corrected, _, status = bch.decode_batch(hard_decisions)
+            positions = [None if status[i] == batch.DECODE_FAILURE else np.flatnonzero(corrected[i] ^ hard_decisions[i]).tolist()
+                         for i in range(len(status))]
+
+        for row, error_positions in zip(llrs, positions):
+            if error_positions is None or len(error_positions) > t:
+                replaced += 1
+                continue
+            stimulus.append(row)
+            answers.append(error_positions)
+
+    return format_stimulus(np.array(stimulus)), format_answers(answers, t), replaced
+
+def main():
+    parser = argparse.ArgumentParser(description='Generates RTL test data and golden answers')
+    parser.add_argument('code', choices=sorted(BCH_CONFIGS), help='BCH code, 400-600 for soft decision')
+    parser.add_argument('--count', type=int, default=CHUNK_SIZE, help='a number of codewords (default: {})'.format(CHUNK_SIZE))
+    parser.add_argument('--snr', type=float, default=6.0, help='Eb/N0 in dB (default: 6)')
+    parser.add_argument('--seed', type=int, default=1, help='a seed of the run (default: 1)')
+    parser.add_argument('--workers', type=int, default=multiprocessing.cpu_count(), help='a number of processes (default: all CPUs)')
+    parser.add_argument('--flips', type=int, choices=range(MAX_FLIPS + 1), metavar='{{0..{}}}'.format(MAX_FLIPS), default=CHASE_FLIPS, help='least reliable positions flipped by soft decision (default: {})'.format(CHASE_FLIPS))
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='codewords per task (default: {})'.format(CHUNK_SIZE))
+    parser.add_argument('--output-dir', type=str, default='.', help='a directory for the files (default: .)')
+    args = parser.parse_args()
+
+    config = BCH_CONFIGS[args.code]
+    tasks = []
+    for chunk, start in enumerate(range(0, args.count, args.chunk_size)):
+        tasks.append((args.seed, chunk, min(args.chunk_size, args.count - start), args.snr))
+
+    input_file = os.path.join(args.output_dir, config['input_file'])
+    answer_file = os.path.join(args.output_dir, config['answer_file'])
+    replaced = 0
+    with open(input_file, 'wb') as stimulus_file, open(answer_file, 'wb') as answers_file:
+        pool = multiprocessing.Pool(args.workers, initializer=init_worker, initargs=(args.code, args.flips))
+        try:
+            for stimulus, answers, chunk_replaced in pool.imap(generate_chunk, tasks):
+                stimulus_file.write(stimulus)
+                answers_file.write(answers)
+                replaced += chunk_replaced
+        finally:
+            pool.terminate()
+
+    print("{}: {} codeword(s) at Eb/N0 = {} dB to {} and {}, {} undecodable replaced".format(
+        config['name'], args.count, args.snr, input_file, answer_file, replaced))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+#-*- coding: utf-8 -*-
+
+"""
+Binary container of LLR test inputs.
+
+A file is a header followed by the LLRs as raw int8, one row of
+n + 1 values (LLR0 to LLRn, LLRi of X^(n-i), as in the text files)
+per codeword. Opened with np.memmap it is an (N, n + 1) int8 matrix
+without any parsing.
+
+NumPy is imported only to read a file, so is_llr_file can tell a
+binary file from a text one without it.
+
+Usage: python3 llrfile.py <code> <text file> <binary file>
+"""
+
+import struct
+import argparse
+from array import array
+
+LLR_FILE_MAGIC = b'BCHLLR'
+LLR_FILE_VERSION = 1
+# magic, version, code ID, n, codeword count
+LLR_FILE_HEADER = struct.Struct('<6sHHHQ')
+
+def is_llr_file(path):
+    """
+    Checks if a file starts with the header of
+    the binary format.
+
+    :param path: a path to the file.
+
+    :returns: True for a binary LLR file.
+    """
+    with open(path, 'rb') as f:
+        return f.read(len(LLR_FILE_MAGIC)) == LLR_FILE_MAGIC
+
+def read_header(f):
+    """
+    Reads and validates the header of an open
+    binary LLR file.
+
+    :param f: a file opened in binary mode.
+
+    :returns: the code ID, n and the number of
+    codewords.
+
+    :raises: ValueError if the file isn't a binary
+    LLR file of a known version.
+    """
+    data = f.read(LLR_FILE_HEADER.size)
+    if len(data) < LLR_FILE_HEADER.size:
+        raise ValueError("The file is too short for a header")
+    magic, version, code_id, n, count = LLR_FILE_HEADER.unpack(data)
+    if magic != LLR_FILE_MAGIC:
+        raise ValueError("Not a binary LLR file")
+    if version != LLR_FILE_VERSION:
+        raise ValueError("Unsupported binary LLR file version {}".format(version))
+    return code_id, n, count
+
+def write_llr_file(path, code_id, n, llr_rows):
+    """
+    Writes LLRs to a binary LLR file as they come,
+    the codeword count is filled in at the end.
+
+    :param path: a path to the file.
+    :param code_id: an ID of the code, e.g. 100.
+    :param n: a length of code.
+    :param llr_rows: an iterable of sequences of
+    n + 1 LLRs, LLR0 to LLRn.
+
+    :returns: the number of codewords written.
+    """
+    count = 0
+    with open(path, 'wb') as f:
+        f.write(LLR_FILE_HEADER.pack(LLR_FILE_MAGIC, LLR_FILE_VERSION, code_id, n, 0))
+        for llr_values in llr_rows:
+            row = array('b', llr_values[:n + 1])
+            if len(row) != n + 1:
+                raise ValueError("A codeword needs {} LLR values, got {}".format(n + 1, len(row)))
+            f.write(row.tobytes())
+            count += 1
+        f.seek(0)
+        f.write(LLR_FILE_HEADER.pack(LLR_FILE_MAGIC, LLR_FILE_VERSION, code_id, n, count))
+    return count
+
+def open_llr_file(path):
+    """
+    Maps a binary LLR file to memory.
+
+    :param path: a path to the file.
+
+    :returns: the code ID and a read-only (N, n + 1)
+    int8 np.memmap of the LLRs.
+    """
+    import numpy as np
+
+    with open(path, 'rb') as f:
+        code_id, n, count = read_header(f)
+    if count == 0:
+        return code_id, np.zeros((0, n + 1), dtype=np.int8)
+    return code_id, np.memmap(path, dtype=np.int8, mode='r', offset=LLR_FILE_HEADER.size, shape=(count, n + 1))
+
+def iter_llr_file(path, n, code_id=None):
+    """
+    Iterates over the codewords of a binary LLR
+    file the way analyze_llr_inputs.iter_codewords does for
+    a text file.
+
+    :param path: a path to the file.
+    :param n: a length of code, checked against
+    the header.
+    :param code_id: the ID of the selected code,
+    checked against the header if given.
+
+    :returns: an iterator over tuples (codeword,
+    llr_values), codeword being the hard decision.
+
+    :raises: ValueError if the file holds another
+    code or another length of code.
+    """
+    file_code_id, llrs = open_llr_file(path)
+    if code_id is not None and file_code_id != code_id:
+        raise ValueError("The file holds codewords of code {}, expected code {}".format(file_code_id, code_id))
+    if llrs.shape[1] != n + 1:
+        raise ValueError("The file holds codewords of n = {}, expected n = {}".format(llrs.shape[1] - 1, n))
+    return iter_hard_decisions(llrs, n)
+
+def iter_hard_decisions(llrs, n):
+    """
+    Yields the hard decisions of rows of LLRs.
+
+    :param llrs: an (N, n + 1) int8 matrix.
+    :param n: a length of code.
+
+    :returns: an iterator over tuples (codeword,
+    llr_values).
+    """
+    import numpy as np
+
+    # the hard decisions of LLR1 to LLRn, MSB first
+    padding = -n % 8
+    for row in llrs:
+        codeword = int.from_bytes(np.packbits(row[1:] < 0).tobytes(), 'big') >> padding
+        yield codeword, array('b', row.tobytes())
+
+def main():
+    from analyze_llr_inputs import BCH_CONFIGS, iter_llr_rows, iter_codewords
+
+    parser = argparse.ArgumentParser(description='Converts a text LLR input file to the binary format')
+    parser.add_argument('code', choices=sorted(BCH_CONFIGS), help='BCH code of the file')
+    parser.add_argument('text_file', help='a text file of 64-bit rows, e.g. p100.txt')
+    parser.add_argument('binary_file', help='a binary file to write')
+    args = parser.parse_args()
+
+    n = BCH_CONFIGS[args.code]['n']
+    llr_rows = (llr_values for _, llr_values in iter_codewords(iter_llr_rows(args.text_file), n=n))
+    count = write_llr_file(args.binary_file, int(args.code), n, llr_rows)
+    print("Wrote {} codeword(s) of n = {} to {}".format(count, n, args.binary_file))
+
+if __name__ == '__main__':
+    main()
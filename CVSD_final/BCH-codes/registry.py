@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+#-*- coding: utf-8 -*-
+
+"""
+Registry of BCH codes built once and cached on disk.
+
+A code is keyed by (m, n, t, b, primitive polynomial) and the
+options of its decoder. It is built on the first request, with its
+field tables, cyclotomic cosets, minimal polynomials, generator and
+encoding/decoding tables, and the whole BCH object is pickled to a
+cache file, so later runs load it instead of building it. The file
+starts with CODE_CACHE_VERSION, a file of another version is ignored
+and rewritten.
+
+Usage: python3 registry.py [--clear]
+"""
+
+import os
+import pickle
+import argparse
+
+from bch import *
+
+CODE_CACHE_VERSION = 2 # bump when BCH or GaloisField change their attributes
+CODE_CACHE_FILE = os.environ.get('BCH_CODE_CACHE',
+                                 os.path.join(os.path.expanduser('~'), '.cache', 'bch-codes', 'codes.pickle'))
+
+class CodeRegistry:
+    """
+    BCH codes by their parameters, built lazily and
+    shared by every user of the registry.
+    """
+
+    def __init__(self, cache_file=CODE_CACHE_FILE):
+        """
+        :param cache_file: a file to load the codes from
+        and save them to, None to keep them in memory
+        only.
+        """
+        self.cache_file = cache_file
+        self.codes = None
+
+    def _load(self):
+        self.codes = {}
+        if self.cache_file is None or not os.path.exists(self.cache_file):
+            return
+        try:
+            with open(self.cache_file, 'rb') as f:
+                version, codes = pickle.load(f)
+        except (OSError, EOFError, ValueError, TypeError, AttributeError, ImportError, pickle.UnpicklingError):
+            return
+        if version == CODE_CACHE_VERSION:
+            self.codes = codes
+
+    def _save(self):
+        """
+        Writes the codes to the cache file. A cache
+        which can't be written only costs the rebuild
+        on the next run, so errors are ignored.
+        """
+        if self.cache_file is None:
+            return
+        # write aside and rename, a concurrent reader sees
+        # either the old file or the new one
+        temporary = "{}.{}".format(self.cache_file, os.getpid())
+        try:
+            directory = os.path.dirname(self.cache_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(temporary, 'wb') as f:
+                pickle.dump((CODE_CACHE_VERSION, self.codes), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary, self.cache_file)
+        except OSError as error:
+            if VERBOSE:
+                print("Can't write the code cache {}: {}".format(self.cache_file, error))
+            try:
+                os.remove(temporary)
+            except OSError:
+                pass
+
+    def get(self, m, n, t, b=1, primitive_polynomial=None, **options):
+        """
+        Returns a BCH code, building and caching it on
+        the first request.
+
+        :param m: the power of the field GF(2ᵐ).
+        :param n: a length of code.
+        :param t: a number of errors to correct.
+        :param b: the first power of the zeroes αᵇ.
+        :param primitive_polynomial: a primitive
+        polynomial of degree m, by default the one of
+        get_primitive_polynomial.
+        :param options: keyword arguments of BCH, e.g.
+        root_finder='closed_form'.
+
+        :returns: a BCH object.
+
+        :raises: ValueError if the primitive polynomial
+        is not of degree m.
+        """
+        if primitive_polynomial is None:
+            primitive_polynomial = get_primitive_polynomial(m)
+        if msb(primitive_polynomial) != m:
+            raise ValueError("The primitive polynomial {:b} is not of degree m = {}".format(primitive_polynomial, m))
+
+        if self.codes is None:
+            self._load()
+        key = (m, n, t, b, primitive_polynomial, tuple(sorted(options.items())))
+        bch = self.codes.get(key)
+        if bch is None:
+            bch = BCH(n, 2 * t + 1, b, primitive_polynomial, **options)
+            self.codes[key] = bch
+            self._save()
+        return bch
+
+    def clear(self):
+        """
+        Forgets every code and removes the cache file.
+        """
+        self.codes = {}
+        if self.cache_file is not None and os.path.exists(self.cache_file):
+            os.remove(self.cache_file)
+
+registry = CodeRegistry()
+
+def get_code(m, n, t, b=1, primitive_polynomial=None, **options):
+    """
+    CodeRegistry.get of the shared registry.
+    """
+    return registry.get(m, n, t, b, primitive_polynomial, **options)
+
+def main():
+    parser = argparse.ArgumentParser(description='Lists or clears the cache of BCH codes')
+    parser.add_argument('--clear', action='store_true', help='remove the cache file')
+    args = parser.parse_args()
+
+    if args.clear:
+        registry.clear()
+        print("Removed {}".format(registry.cache_file))
+        return
+
+    registry._load()
+    print("{} code(s) in {}".format(len(registry.codes), registry.cache_file))
+    for (m, n, t, b, primitive_polynomial, options), bch in sorted(registry.codes.items()):
+        print("({}, {}) t = {}, m = {}, b = {}, p(x) = {:b} {}".format(
+            n, bch.k, t, m, b, primitive_polynomial, dict(options) if options else ""))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+#-*- coding: utf-8 -*-
+
+"""
+Monte Carlo simulation of frame and bit error rates of a BCH code
+over an AWGN channel.
+
+The work is split into chunks of frames per Eb/N0 point, each simulated
+on a process pool from its own seed SeedSequence([seed, point, chunk]).
+The parent adds up the chunks of a point in chunk order and stops the
+point after the first chunk which brings the frame errors to the
+target, results of later chunks are dropped. So the table only depends
+on the seed, never on the number of workers or the order chunks finish.
+
+With --importance the error rates of hard decision decoding are found
+by importance sampling instead: the number of channel errors in a frame
+is binomial, so frames are simulated with error patterns of each weight
+w > t injected directly and the per-weight results are weighted with
+the exact probabilities C(n, w)pʷ(1-p)ⁿ⁻ʷ of every Eb/N0 point. A bounded
+distance decoder corrects every weight up to t and fails or miscorrects
+every weight above, so the FER is the exact binomial tail P(w > t) and
+only the BER and the miscorrection probability are sampled, with
+confidence intervals. The estimates are unbiased, need no frames at the
+rare weights the channel produces, and the same samples serve every
+Eb/N0 point, so rates of 1e-9 and below take as long as 1e-2.
+
+Usage: python3 simulation.py [--snr 1 2 ...] [--target-errors E]
+       [--max-frames F] [--seed S] [--workers W] [--uncoded]
+       [--importance [--frames-per-weight F]]
+"""
+
+import math
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+import numpy as np
+
+from bch import *
+import channel
+from analytical import get_log_weight_probability, get_error_rates_for_crossover
+
+CHUNK_FRAMES = 1000
+TARGET_FRAME_ERRORS = 100
+MAX_FRAMES = 1000000
+FRAMES_PER_WEIGHT = 10000 # importance sampling frames per error weight
+TAIL_PROBABILITY = 1e-6 # relative FER left out above the largest sampled weight
+CONFIDENCE_Z = 1.96 # 95% confidence intervals
+
+code = None # BCH of a worker, see init_worker
+
+def init_worker(bch):
+    global code
+    code = bch
+
+def simulate_chunk(arguments):
+    """
+    Sends a chunk of random frames over the channel
+    and decodes them, or compares them as they are
+    without a code.
+
+    :param arguments: the seed of the run, the index
+    of the point, Eb/N0, the index of the chunk, the
+    number of frames and the length of an uncoded
+    frame.
+
+    :returns: the numbers of frame errors and of
+    message bit errors.
+    """
+    seed, point, signal_to_noise_ratio, chunk, frames, n = arguments
+    rng = np.random.default_rng(np.random.SeedSequence([seed, point, chunk]))
+
+    k = code.k if code is not None else n
+    messages = rng.integers(0, 2, size=(frames, k), dtype=np.uint8)
+    codewords = code.encode_batch(messages) if code is not None else messages
+    sigma = channel.get_sigma(signal_to_noise_ratio, k / (codewords.shape[1] * 1.))
+
+    received = channel.transmit(codewords, sigma, rng)
+    hard_decisions = channel.hard_decisions(received)
+
+    if code is not None:
+        _, decoded, _ = code.decode_batch(hard_decisions)
+    else:
+        decoded = hard_decisions
+
+    errors = decoded != messages
+    return int(errors.any(axis=1).sum()), int(errors.sum())
+
+def simulate(bch, signal_to_noise_ratios, n=None, seed=1, workers=None, chunk_frames=CHUNK_FRAMES,
+             target_frame_errors=TARGET_FRAME_ERRORS, max_frames=MAX_FRAMES):
+    """
+    Estimates error rates at several Eb/N0 points.
+
+    :param bch: a BCH code, None to send messages
+    of n bits uncoded.
+    :param signal_to_noise_ratios: Eb/N0 points in dB.
+    :param n: a length of an uncoded message.
+    :param seed: a seed of the run.
+    :param workers: a number of processes, all CPUs
+    by default.
+    :param chunk_frames: frames per task.
+    :param target_frame_errors: frame errors after
+    which a point stops.
+    :param max_frames: frames after which a point
+    stops anyway.
+
+    :returns: a list of dictionaries with the keys
+    snr, frames, frame_errors, bit_errors, fer and
+    ber, one per point.
+    """
+    k = bch.k if bch is not None else n
+    chunk_count = -(-max_frames // chunk_frames)
+    points = []
+    for signal_to_noise_ratio in signal_to_noise_ratios:
+        points.append({
+            'snr': signal_to_noise_ratio, 'frames': 0, 'frame_errors': 0, 'bit_errors': 0,
+            'submitted': 0, 'next': 0, 'results': {}, 'done': False})
+
+    def get_task():
+        # the next chunk of the first unfinished point, or None
+        for index, state in enumerate(points):
+            if not state['done'] and state['submitted'] < chunk_count:
+                chunk = state['submitted']
+                state['submitted'] += 1
+                frames = min(chunk_frames, max_frames - chunk * chunk_frames)
+                return (seed, index, state['snr'], chunk, frames, n), frames
+        return None
+
+    workers = workers or multiprocessing.cpu_count()
+    with ProcessPoolExecutor(workers, initializer=init_worker, initargs=(bch,)) as executor:
+        pending = {}
+        while True:
+            # keep two tasks per worker in flight, earlier points first
+            while len(pending) < 2 * workers:
+                task = get_task()
+                if task is None:
+                    break
+                arguments, frames = task
+                pending[executor.submit(simulate_chunk, arguments)] = (arguments[1], arguments[3], frames)
+            if not pending:
+                break
+
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                index, chunk, frames = pending.pop(future)
+                state = points[index]
+                if state['done']:
+                    continue
+                state['results'][chunk] = (frames,) + future.result()
+
+                # add up the chunks in order
+                while not state['done'] and state['next'] in state['results']:
+                    frames, frame_errors, bit_errors = state['results'].pop(state['next'])
+                    state['next'] += 1
+                    state['frames'] += frames
+                    state['frame_errors'] += frame_errors
+                    state['bit_errors'] += bit_errors
+                    if state['frame_errors'] >= target_frame_errors or state['next'] == chunk_count:
+                        state['done'] = True
+
+    table = []
+    for state in points:
+        table.append({
+            'snr': state['snr'],
+            'frames': state['frames'],
+            'frame_errors': state['frame_errors'],
+            'bit_errors': state['bit_errors'],
+            'fer': state['frame_errors'] / (state['frames'] * 1.),
+            'ber': state['bit_errors'] / (state['frames'] * k * 1.)})
+    return table
+
+def get_max_weight(n, t, crossover_probabilities, tail_probability=TAIL_PROBABILITY):
+    """
+    Finds the largest error weight to sample, such
+    that more errors have a probability below
+    tail_probability of the probability of more
+    than t errors at every crossover probability.
+    """
+    max_weight = t + 1
+    for p in crossover_probabilities:
+        probabilities = [math.exp(get_log_weight_probability(n, weight, p)) for weight in range(t + 1, n + 1)]
+        total = sum(probabilities)
+        tail = total
+        for weight, probability in enumerate(probabilities, t + 1):
+            tail -= probability
+            if tail <= tail_probability * total:
+                max_weight = max(max_weight, weight)
+                break
+    return max_weight
+
+def simulate_weight_chunk(arguments):
+    """
+    Decodes random codewords with error patterns of
+    one weight.
+
+    :param arguments: the seed of the run, the weight,
+    the index of the chunk and the number of frames.
+
+    :returns: the number of miscorrections, the sum of
+    the fractions of wrong message bits and the sum of
+    their squares.
+    """
+    import batch
+
+    seed, weight, chunk, frames = arguments
+    rng = np.random.default_rng(np.random.SeedSequence([seed, weight, chunk]))
+
+    messages = rng.integers(0, 2, size=(frames, code.k), dtype=np.uint8)
+    codewords = code.encode_batch(messages)
+    positions = np.argpartition(rng.random((frames, code.n)), weight - 1, axis=1)[:, :weight]
+    errors = np.zeros_like(codewords)
+    np.put_along_axis(errors, positions, 1, axis=1)
+
+    decoded_codewords, decoded, status = code.decode_batch(codewords ^ errors)
+    frame_errors = (decoded_codewords != codewords).any(axis=1)
+    bit_errors = (decoded != messages).sum(axis=1) / (code.k * 1.)
+    miscorrections = frame_errors & (status != batch.DECODE_FAILURE)
+    return int(miscorrections.sum()), float(bit_errors.sum()), float((bit_errors ** 2).sum())
+
+def simulate_importance(bch, signal_to_noise_ratios, seed=1, workers=None, chunk_frames=CHUNK_FRAMES,
+                        frames_per_weight=FRAMES_PER_WEIGHT, tail_probability=TAIL_PROBABILITY):
+    """
+    Estimates error rates of hard decision decoding
+    at several Eb/N0 points by importance sampling
+    of error weights. Every weight above t is a frame
+    error of a bounded distance decoder, so the FER is
+    computed exactly and not sampled.
+
+    :param bch: a BCH code.
+    :param signal_to_noise_ratios: Eb/N0 points in dB.
+    :param seed: a seed of the run.
+    :param workers: a number of processes, all CPUs
+    by default.
+    :param chunk_frames: frames per task.
+    :param frames_per_weight: frames simulated for
+    every error weight.
+    :param tail_probability: the part of the FER
+    above the largest sampled weight, whose bit
+    errors are those of the largest weight.
+
+    :returns: a list of dictionaries with the keys
+    snr, p, frames, fer, ber, ber_interval,
+    miscorrection and miscorrection_interval, one
+    per point, fer being exact and the intervals
+    half-widths of 95% confidence intervals.
+    """
+    n, k, t = bch.n, bch.k, bch.t
+    crossover_probabilities = [channel.get_crossover_probability(channel.get_sigma(signal_to_noise_ratio, k / (n * 1.)))
+                               for signal_to_noise_ratio in signal_to_noise_ratios]
+    max_weight = get_max_weight(n, t, crossover_probabilities, tail_probability)
+
+    tasks = []
+    for weight in range(t + 1, max_weight + 1):
+        for chunk, start in enumerate(range(0, frames_per_weight, chunk_frames)):
+            tasks.append((seed, weight, chunk, min(chunk_frames, frames_per_weight - start)))
+
+    # miscorrections, bit error fractions and their squares per weight
+    statistics = {weight: [0, 0.0, 0.0] for weight in range(t + 1, max_weight + 1)}
+    workers = workers or multiprocessing.cpu_count()
+    with ProcessPoolExecutor(workers, initializer=init_worker, initargs=(bch,)) as executor:
+        for (_, weight, _, _), result in zip(tasks, executor.map(simulate_weight_chunk, tasks)):
+            for index, value in enumerate(result):
+                statistics[weight][index] += value
+
+    table = []
+    for signal_to_noise_ratio, p in zip(signal_to_noise_ratios, crossover_probabilities):
+        ber = ber_variance = miscorrection = miscorrection_variance = 0.0
+        sampled = 0.0
+        for weight in range(t + 1, max_weight + 1):
+            probability = math.exp(get_log_weight_probability(n, weight, p))
+            miscorrections, bit_errors, bit_errors_squared = statistics[weight]
+            miscorrection_rate = miscorrections / (frames_per_weight * 1.)
+            bit_error_rate = bit_errors / frames_per_weight
+            bit_error_variance = max(bit_errors_squared / frames_per_weight - bit_error_rate ** 2, 0.0)
+
+            sampled += probability
+            ber += probability * bit_error_rate
+            ber_variance += probability ** 2 * bit_error_variance / frames_per_weight
+            miscorrection += probability * miscorrection_rate
+            miscorrection_variance += probability ** 2 * miscorrection_rate * (1 - miscorrection_rate) / frames_per_weight
+
+        # every weight above t is a frame error, more errors than max_weight
+        # have the bit error rate of max_weight
+        fer = get_error_rates_for_crossover(n, k, t, p)['fer']
+        ber += max(fer - sampled, 0.0) * statistics[max_weight][1] / frames_per_weight
+
+        table.append({
+            'snr': signal_to_noise_ratio,
+            'p': p,
+            'frames': frames_per_weight * (max_weight - t),
+            'fer': fer,
+            'ber': ber,
+            'ber_interval': CONFIDENCE_Z * math.sqrt(ber_variance),
+            'miscorrection': miscorrection,
+            'miscorrection_interval': CONFIDENCE_Z * math.sqrt(miscorrection_variance)})
+    return table
+
+def print_importance_table(table):
+    print("Eb/N0, dB │        p │ FER, exact │      BER ± 95%         │ miscorrection ± 95%")
+    for row in table:
+        print("{:>9} │ {:>8.2e} │ {:>10.2e} │ {:>8.2e} ± {:>8.2e}   │ {:>8.2e} ± {:>8.2e}".format(
+            row['snr'], row['p'], row['fer'], row['ber'], row['ber_interval'], row['miscorrection'], row['miscorrection_interval']))
+
+def print_table(table):
+    print("Eb/N0, dB │   frames │ frame errors │      FER │      BER")
+    for row in table:
+        print("{:>9} │ {:>8} │ {:>12} │ {:>8.2e} │ {:>8.2e}".format(
+            row['snr'], row['frames'], row['frame_errors'], row['fer'], row['ber']))
+
+def main():
+    parser = argparse.ArgumentParser(description='Monte Carlo BER/FER of a BCH code over AWGN')
+    parser.add_argument('--n', type=int, default=255, help='a length of code (default: 255)')
+    parser.add_argument('--t', type=int, default=2, help='a number of errors to correct (default: 2)')
+    parser.add_argument('--m', type=int, default=8, help='the power of the field GF(2ᵐ) (default: 8)')
+    parser.add_argument('--uncoded', action='store_true', help='send n-bit messages without a code')
+    parser.add_argument('--snr', type=float, nargs='+', default=[float(x) for x in range(1, 13)], help='Eb/N0 points in dB (default: 1 .. 12)')
+    parser.add_argument('--target-errors', type=int, default=TARGET_FRAME_ERRORS, help='frame errors to stop a point at (default: {})'.format(TARGET_FRAME_ERRORS))
+    parser.add_argument('--max-frames', type=int, default=MAX_FRAMES, help='frames to stop a point at (default: {})'.format(MAX_FRAMES))
+    parser.add_argument('--chunk-frames', type=int, default=CHUNK_FRAMES, help='frames per task (default: {})'.format(CHUNK_FRAMES))
+    parser.add_argument('--seed', type=int, default=1, help='a seed of the run (default: 1)')
+    parser.add_argument('--importance', action='store_true', help='importance sampling of error weights for hard decision decoding, the FER is exact')
+    parser.add_argument('--frames-per-weight', type=int, default=FRAMES_PER_WEIGHT, help='importance sampling frames per error weight (default: {})'.format(FRAMES_PER_WEIGHT))
+    parser.add_argument('--workers', type=int, default=multiprocessing.cpu_count(), help='a number of processes (default: all CPUs)')
+    args = parser.parse_args()
+
+    bch = None if args.uncoded else BCH(args.n, 2 * args.t + 1, 1, get_primitive_polynomial(args.m))
+    if args.importance:
+        if bch is None:
+            parser.error("--importance needs a code")
+        table = simulate_importance(bch, args.snr, seed=args.seed, workers=args.workers, chunk_frames=args.chunk_frames,
+                                    frames_per_weight=args.frames_per_weight)
+        print_importance_table(table)
+        return
+
+    table = simulate(bch, args.snr, n=args.n, seed=args.seed, workers=args.workers, chunk_frames=args.chunk_frames,
+                     target_frame_errors=args.target_errors, max_frames=args.max_frames)
+    print_table(table)
+
+if __name__ == '__main__':
+    main()
@@ -3,8 +3,12 @@
 
 import sys
 import random
+import argparse
 
 from bch import *
+import weight_distribution
+
+TRIALS = 10000 # random codewords per m of the Monte Carlo table
 
 
 def get_random_messages(count, n):
@@ -15,16 +19,21 @@ def get_random_messages(count, n):
     
     return messages
 
-def get_hamming_weight(num):
-    weight = 0
-
-    for i in range(msb(num)):
-        if is_bit_set(num, i):
-            weight += 1
-
-    return weight
+def error_probability(exact=True, use_batch=True, trials=TRIALS):
+    """
+    Prints the percentages of wrong decodings with t
+    and t + 1 errors for the codes of m = 4 .. 10.
+
+    :param exact: True to compute them from the
+    weight distributions, False for a Monte Carlo
+    simulation.
+    :param use_batch: True to decode the simulated
+    codewords with BCH.decode_batch, requires NumPy.
+    :param trials: a number of simulated codewords.
+    """
+    if not exact and use_batch:
+        import batch
 
-def error_probability():
     print("│     m     │    bch    │     t     │    t + 1   │ ")
     print("├───────────┼───────────┼───────────┼────────────┤ ")
 
@@ -43,61 +52,75 @@ def error_probability():
 
         bch = BCH(n, 2 * t + 1, 1, get_primitive_polynomial(m))
 
-        # encoding
-        blocks = []
-        encoded_codewords = []
-        for block in get_random_messages(count=10000, n=bch.k):
-            blocks.append(block)
-            codeword = bch.encode(block)
-            if VERBOSE:
-                print("Block: {0:>0{a}b}, codeword: {1:>0{b}b}".format(block, codeword, a=bch.n - bch.t * bch.power, b=bch.n))
-            encoded_codewords.append(codeword)
-
-        for error_number in range(t, t + 2):
-            if VERBOSE:
-                print("Running with t = {}".format(error_number))
-            # distortion
-            distorted_codewords = []
-            for codeword in encoded_codewords:
-                error_vector = get_random_number_of_hamming_weight(length=bch.n, weight=error_number)
-                distorted_codeword = codeword ^ error_vector
-
+        if exact:
+            weights = weight_distribution.get_weight_distribution(bch.generator_polynomial, bch.n)
+            for error_number in range(t, t + 2):
+                procent.append(100. * float(weight_distribution.get_miscorrection_probability(weights, bch.n, t, error_number)))
+        else:
+            # encoding
+            blocks = []
+            encoded_codewords = []
+            for block in get_random_messages(count=trials, n=bch.k):
+                blocks.append(block)
+                codeword = bch.encode(block)
                 if VERBOSE:
-                    print("Codeword: {0:0>{a}b}, error vector: {1:0>{a}b}, distorted codeword: {2:0>{a}b}".
-                        format(codeword, error_vector, distorted_codeword, a=bch.n))
-                distorted_codewords.append(distorted_codeword)
-            
-            # correcting
-            right  = 0
-            wrong  = 0
-            cancel = 0
-
-            bits_corrupted = 0
-            bits_all = 0
-
-            for codeword in range(len(distorted_codewords)):
-                try:
-                    message, decoded_codeword = bch.decode_ex(distorted_codewords[codeword])
-                except Exception:
-                    cancel += 1
-                    continue
+                    print("Block: {0:>0{a}b}, codeword: {1:>0{b}b}".format(block, codeword, a=bch.n - bch.t * bch.power, b=bch.n))
+                encoded_codewords.append(codeword)
 
+            for error_number in range(t, t + 2):
                 if VERBOSE:
-                    print("Codeword: {0:0>{a}b}, Decoded message: {1:0>{a}b}".
-                        format(blocks[codeword], message, a=bch.k))
+                    print("Running with t = {}".format(error_number))
+                # distortion
+                distorted_codewords = []
+                for codeword in encoded_codewords:
+                    error_vector = get_random_number_of_hamming_weight(length=bch.n, weight=error_number)
+                    distorted_codeword = codeword ^ error_vector
+
+                    if VERBOSE:
+                        print("Codeword: {0:0>{a}b}, error vector: {1:0>{a}b}, distorted codeword: {2:0>{a}b}".
+                            format(codeword, error_vector, distorted_codeword, a=bch.n))
+                    distorted_codewords.append(distorted_codeword)
+            
+                # correcting
+                right  = 0
+                wrong  = 0
+                cancel = 0
+
+                bits_corrupted = 0
+                bits_all = 0
+
+                if use_batch:
+                    decoded_bits, message_bits, status = bch.decode_batch(batch.ints_to_bits(distorted_codewords, bch.n))
+                    decoded = list(zip(batch.bits_to_ints(message_bits), batch.bits_to_ints(decoded_bits), status))
+
+                for codeword in range(len(distorted_codewords)):
+                    try:
+                        if use_batch:
+                            message, decoded_codeword, status = decoded[codeword]
+                            if status == batch.DECODE_FAILURE:
+                                raise DecodingFailure("Decoding failure")
+                        else:
+                            message, decoded_codeword = bch.decode_ex(distorted_codewords[codeword])
+                    except Exception:
+                        cancel += 1
+                        continue
+
+                    if VERBOSE:
+                        print("Codeword: {0:0>{a}b}, Decoded message: {1:0>{a}b}".
+                            format(blocks[codeword], message, a=bch.k))
                 
-                bits_all += bch.n
-                if blocks[codeword] == message:
-                    right += 1
-                else:
-                    wrong += 1
-                    bits_corrupted += get_hamming_weight(distorted_codewords[codeword] ^ decoded_codeword)
+                    bits_all += bch.n
+                    if blocks[codeword] == message:
+                        right += 1
+                    else:
+                        wrong += 1
+                        bits_corrupted += get_hamming_weight(distorted_codewords[codeword] ^ decoded_codeword)
 
-            assert right + wrong + cancel == len(encoded_codewords)
+                assert right + wrong + cancel == len(encoded_codewords)
 
-            procent.append(wrong)
+                procent.append(100. * wrong / len(encoded_codewords))
 
-        print("│     {:<2}    │  {:<2} {:<2} {:<2} │     {:<3}   │    {:<4}    │ ".format(
+        print("│     {:<2}    │  {:<2} {:<2} {:<2} │ {:>8.4f}% │ {:>8.4f}%  │ ".format(
             bch.power,
             bch.n, bch.k, bch.dist,
             procent[0],
@@ -106,5 +129,14 @@ def error_probability():
 
         procent = []
 
+def main():
+    parser = argparse.ArgumentParser(description='Probability of wrong decoding with t and t + 1 errors')
+    parser.add_argument('--monte-carlo', action='store_true', help='simulate instead of the exact weight distributions')
+    parser.add_argument('--trials', type=int, default=TRIALS, help='codewords per m of a simulation (default: {})'.format(TRIALS))
+    parser.add_argument('--scalar', action='store_true', help='decode a simulation with BCH.decode_ex instead of BCH.decode_batch')
+    args = parser.parse_args()
+
+    error_probability(exact=not args.monte_carlo, use_batch=not args.scalar, trials=args.trials)
+
 if __name__ == '__main__':
-    error_probability()
+    main()
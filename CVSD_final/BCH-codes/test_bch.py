@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+#-*- coding: utf-8 -*-
+
+"""
+Tests of the BCH encoder and decoder.
+
+Usage: python3 -m unittest test_bch
+"""
+
+import random
+import unittest
+
+from bch import *
+
+class ChaseDecoderTest(unittest.TestCase):
+    def setUp(self):
+        self.bch = BCH(15, 5, 1, get_primitive_polynomial(4))
+        codeword = self.bch.encode(random.Random(1).getrandbits(self.bch.k))
+        self.llr_values = [-4 if codeword >> i & 1 else 4 for i in range(self.bch.n)]
+
+    def test_decodes_without_flips(self):
+        self.assertEqual(self.bch.decode_soft(self.llr_values, flips=0), self.bch.decode_soft(self.llr_values))
+
+    def test_rejects_negative_flips(self):
+        with self.assertRaises(ValueError):
+            self.bch.decode_soft(self.llr_values, flips=-1)
+
+    def test_rejects_more_flips_than_positions(self):
+        with self.assertRaises(ValueError):
+            self.bch.decode_soft(self.llr_values, flips=self.bch.n + 1)
+
+    def test_rejects_more_flips_than_max_flips(self):
+        bch = BCH(63, 5, 1, get_primitive_polynomial(6))
+        with self.assertRaises(ValueError):
+            bch.decode_soft([1] * bch.n, flips=MAX_FLIPS + 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+#-*- coding: utf-8 -*-
+
+"""
+Tests of the binary LLR file format.
+
+Usage: python3 -m unittest test_llrfile
+"""
+
+import os
+import tempfile
+import unittest
+
+import llrfile
+
+class LLRFileTest(unittest.TestCase):
+    def setUp(self):
+        self.n = 63
+        # LLR0 and then LLR1 to LLRn, a 1 in every third bit
+        self.rows = [[0] + [-3 if i % 3 == 0 else 5 for i in range(1, self.n + 1)] for _ in range(2)]
+        handle, self.path = tempfile.mkstemp(suffix='.bin')
+        os.close(handle)
+        llrfile.write_llr_file(self.path, 100, self.n, self.rows)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_reads_the_selected_code(self):
+        codewords = list(llrfile.iter_llr_file(self.path, self.n, code_id=100))
+        self.assertEqual(len(codewords), 2)
+        self.assertEqual(codewords[0][0], int("".join("1" if llr < 0 else "0" for llr in self.rows[0][1:]), 2))
+        self.assertEqual(list(codewords[0][1]), self.rows[0])
+
+    def test_rejects_another_code_of_the_same_length(self):
+        with self.assertRaises(ValueError):
+            llrfile.iter_llr_file(self.path, self.n, code_id=400)
+
+    def test_rejects_another_length(self):
+        with self.assertRaises(ValueError):
+            llrfile.iter_llr_file(self.path, 255)
+
+if __name__ == '__main__':
+    unittest.main()
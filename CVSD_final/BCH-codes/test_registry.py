@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+#-*- coding: utf-8 -*-
+
+"""
+Tests of the registry of BCH codes.
+
+Usage: python3 -m unittest test_registry
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from registry import *
+
+class CodeRegistryTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_loads_a_saved_code(self):
+        cache_file = os.path.join(self.directory, 'codes.pickle')
+        bch = CodeRegistry(cache_file).get(6, 63, 2)
+        loaded = CodeRegistry(cache_file).get(6, 63, 2)
+        self.assertIsNot(loaded, bch)
+        self.assertEqual(loaded.generator_polynomial, bch.generator_polynomial)
+
+    def test_builds_a_code_if_the_cache_cant_be_written(self):
+        # a regular file can't be a directory of the cache
+        blocker = os.path.join(self.directory, 'file')
+        open(blocker, 'w').close()
+        registry = CodeRegistry(os.path.join(blocker, 'codes.pickle'))
+
+        bch = registry.get(6, 63, 2)
+        self.assertEqual((bch.n, bch.k, bch.t), (63, 51, 2))
+        self.assertIs(registry.get(6, 63, 2), bch)
+        self.assertEqual(os.listdir(self.directory), ['file'])
+
+if __name__ == '__main__':
+    unittest.main()
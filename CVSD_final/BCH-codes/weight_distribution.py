@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+#-*- coding: utf-8 -*-
+
+"""
+Weight distribution of a BCH code and the exact probabilities of the
+outcomes of bounded distance decoding.
+
+A code of length n with the generator polynomial g(x) has 2ᵏ codewords
+a(x)g(x), its dual code 2ⁿ⁻ᵏ codewords u·H, column j of H being
+xʲ mod g(x). The smaller of the two is enumerated in Gray code order,
+one XOR of a row per codeword, and the weight distribution of the code
+itself is found from that of its dual with the MacWilliams identity
+Aᵥ = 2ᵏ⁻ⁿ Σⱼ Bⱼ Kᵥ(j), Kᵥ being Krawtchouk polynomials.
+
+A word with w errors is miscorrected when it lies within distance t of
+another codeword. The decoding spheres don't intersect, so counting
+the weight w patterns within distance t of every codeword of weight v
+gives the exact probability.
+
+Usage: python3 weight_distribution.py
+"""
+
+from fractions import Fraction
+from math import comb
+
+from bch import *
+
+WEIGHT_ENUMERATION_MAX_BITS = 24 # 2²⁴ codewords of the code or of its dual
+
+def get_generator_rows(generator_polynomial, n):
+    """
+    Rows xⁱg(x) of a generator matrix of the code.
+    """
+    return [generator_polynomial << i for i in range(n - msb(generator_polynomial))]
+
+def get_parity_check_rows(generator_polynomial, n):
+    """
+    Rows of a parity check matrix of the code,
+    column j being xʲ mod g(x).
+    """
+    degree = msb(generator_polynomial)
+    rows = [0] * degree
+    remainder = 1
+    for j in range(n):
+        for row in get_positions_of_binary_ones(remainder):
+            rows[row] |= 1 << j
+        remainder <<= 1
+        if remainder >> degree & 1:
+            remainder ^= generator_polynomial
+    return rows
+
+def enumerate_weights(rows, n):
+    """
+    Counts the words of every weight in the span of
+    linearly independent rows.
+
+    :param rows: rows of a generator matrix as ints.
+    :param n: a length of code.
+
+    :returns: a list of n + 1 counts, by weight.
+    """
+    weights = [0] * (n + 1)
+    weights[0] = 1
+    word = 0
+    for i in range(1, 1 << len(rows)):
+        # Gray code, the next word differs in one row
+        word ^= rows[(i & -i).bit_length() - 1]
+        weights[get_hamming_weight(word)] += 1
+    return weights
+
+def get_krawtchouk(n, weight, j):
+    """
+    Krawtchouk polynomial Kᵥ(j) = Σᵢ (-1)ⁱC(j, i)C(n-j, v-i).
+    """
+    return sum((-1) ** i * comb(j, i) * comb(n - j, weight - i) for i in range(min(j, weight) + 1))
+
+def macwilliams_transform(dual_weights, n):
+    """
+    Weight distribution of a code from that of its
+    dual with the MacWilliams identity.
+
+    :param dual_weights: the counts of the dual code.
+    :param n: a length of code.
+
+    :returns: a list of n + 1 counts, by weight.
+    """
+    size = sum(dual_weights)
+    weights = []
+    for weight in range(n + 1):
+        total = sum(count * get_krawtchouk(n, weight, j) for j, count in enumerate(dual_weights) if count)
+        assert total % size == 0
+        weights.append(total // size)
+    return weights
+
+def get_weight_distribution(generator_polynomial, n, max_bits=WEIGHT_ENUMERATION_MAX_BITS):
+    """
+    Weight distribution of the code of length n with
+    the generator polynomial, enumerating the code or
+    its dual, whichever is smaller.
+
+    :param generator_polynomial: g(x).
+    :param n: a length of code.
+    :param max_bits: the largest k or n - k to
+    enumerate.
+
+    :returns: a list of n + 1 counts Aᵥ, by weight.
+
+    :raises: ValueError if both k and n - k are
+    above max_bits.
+    """
+    degree = msb(generator_polynomial)
+    k = n - degree
+    if min(k, degree) > max_bits:
+        raise ValueError("Weight enumeration needs 2^{} codewords, the limit is 2^{}".format(min(k, degree), max_bits))
+
+    if k <= degree:
+        return enumerate_weights(get_generator_rows(generator_polynomial, n), n)
+    return macwilliams_transform(enumerate_weights(get_parity_check_rows(generator_polynomial, n), n), n)
+
+def get_sphere_intersection(n, t, errors, weight):
+    """
+    Number of words of weight w within distance t of
+    a fixed word of weight v: those differing from it
+    in a of its v ones and b of its n - v zeros, with
+    a + b ≤ t and v - a + b = w.
+    """
+    count = 0
+    for a in range(min(weight, t) + 1):
+        b = errors - weight + a
+        if 0 <= b <= t - a:
+            count += comb(weight, a) * comb(n - weight, b)
+    return count
+
+def get_miscorrection_probability(weights, n, t, errors):
+    """
+    Exact probability that a random error pattern of
+    a given weight is decoded to a wrong codeword by
+    a bounded distance decoder.
+
+    :param weights: the weight distribution.
+    :param n: a length of code.
+    :param t: a number of errors to correct.
+    :param errors: a weight of the error pattern.
+
+    :returns: the probability as a Fraction.
+    """
+    if errors <= t:
+        return Fraction(0)
+    patterns = sum(count * get_sphere_intersection(n, t, errors, weight)
+                   for weight, count in enumerate(weights) if weight and count)
+    return Fraction(patterns, comb(n, errors))
+
+def get_decoding_probabilities(weights, n, t, errors):
+    """
+    Exact outcome of bounded distance decoding of a
+    random error pattern of a given weight.
+
+    :returns: the probabilities of a right decoding,
+    a wrong decoding and a decoding failure as
+    Fractions.
+    """
+    if errors <= t:
+        return Fraction(1), Fraction(0), Fraction(0)
+    wrong = get_miscorrection_probability(weights, n, t, errors)
+    return Fraction(0), wrong, 1 - wrong
+
+def main():
+    from analyze_llr_inputs import BCH_CONFIGS
+
+    for config in BCH_CONFIGS.values():
+        if config.get('soft', False):
+            continue
+        bch = BCH(config['n'], 2 * config['t'] + 1, 1, get_primitive_polynomial(config['m']))
+        try:
+            weights = get_weight_distribution(bch.generator_polynomial, bch.n)
+        except ValueError as error:
+            print("{}: {}".format(config['name'], error))
+            continue
+        distance = next(weight for weight, count in enumerate(weights) if weight and count)
+        print("{}: {} codewords of the minimum weight {}, t + 1 errors miscorrected with probability {:.6f}".format(
+            config['name'], weights[distance], distance,
+            float(get_miscorrection_probability(weights, bch.n, bch.t, bch.t + 1))))
+
+if __name__ == '__main__':
+    main()